@@ -0,0 +1,225 @@
+import argparse
+import dataclasses
+import json
+import math
+import pathlib
+import sys
+import tempfile
+import typing
+
+from generators import DEFAULT_SEED, GENERATORS, write_input
+from runner import (
+    PARTS,
+    DayModule,
+    PartResult,
+    Task,
+    discover_day_modules,
+    run_tasks,
+    select_day_modules,
+)
+
+
+DEFAULT_SCALES = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+DEFAULT_TIMEOUT = 60.0
+
+
+@dataclasses.dataclass
+class ScalingPoint:
+    scale: float
+    input_bytes: int
+    result: PartResult
+
+
+@dataclasses.dataclass
+class ScalingCurve:
+    day: int
+    module: str
+    part: int
+    points: list[ScalingPoint] = dataclasses.field(default_factory=list)
+
+    @property
+    def passed_points(self) -> list[ScalingPoint]:
+        return [
+            point
+            for point in self.points
+            if point.result.passed and point.result.wall_time > 0
+        ]
+
+    @property
+    def exponent(self) -> typing.Optional[float]:
+        points = self.passed_points
+        if len(points) < 2:
+            return None
+        xs = [math.log(point.scale) for point in points]
+        ys = [math.log(point.result.wall_time) for point in points]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        if variance == 0:
+            return None
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        return covariance / variance
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        return {
+            "day": self.day,
+            "module": self.module,
+            "part": self.part,
+            "exponent": self.exponent,
+            "points": [
+                {
+                    "scale": point.scale,
+                    "input_bytes": point.input_bytes,
+                    **dataclasses.asdict(point.result),
+                }
+                for point in self.points
+            ],
+        }
+
+
+def benchmark_day_module(
+    day_module: DayModule,
+    parts: typing.Sequence[int],
+    scales: typing.Sequence[float],
+    directory: pathlib.Path,
+    seed: int = DEFAULT_SEED,
+    trace_memory: bool = False,
+    timeout: typing.Optional[float] = DEFAULT_TIMEOUT,
+) -> list[ScalingCurve]:
+    curves = [ScalingCurve(day_module.day, day_module.label, part) for part in parts]
+    running_curves = list(curves)
+    for scale in sorted(scales):
+        if not running_curves:
+            break
+        path = write_input(
+            day_module.day,
+            directory / f"day{day_module.day:02}_x{scale:g}.txt",
+            scale,
+            seed,
+        )
+        input_bytes = path.stat().st_size
+        for curve in list(running_curves):
+            task = Task(day_module, curve.part, str(path), trace_memory, timeout)
+            result = next(run_tasks([task]))
+            curve.points.append(ScalingPoint(scale, input_bytes, result))
+            if not result.passed:
+                running_curves.remove(curve)
+    return curves
+
+
+def write_json(curves: list[ScalingCurve], output: typing.TextIO) -> None:
+    json.dump([curve.as_dict() for curve in curves], output, indent=2)
+    output.write("\n")
+    return None
+
+
+def write_text(curves: list[ScalingCurve], output: typing.TextIO) -> None:
+    for curve in curves:
+        exponent = curve.exponent
+        exponent_text = f"{exponent:.2f}" if exponent is not None else "n/a"
+        output.write(
+            f"{curve.module} part {curve.part}: time ~ scale^{exponent_text}\n"
+        )
+        for point in curve.points:
+            result = point.result
+            status = "ok" if result.passed else result.error
+            output.write(
+                f"  x{point.scale:<6g} {point.input_bytes:>10} bytes "
+                f"{result.wall_time:10.4f}s {result.peak_rss_kb:>8} KiB  {status}\n"
+            )
+    return None
+
+
+def parse_scales(value: str) -> list[float]:
+    return [float(scale) for scale in value.split(",") if scale]
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure how each solver scales on synthetic inputs."
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark")
+    parser.add_argument(
+        "-p",
+        "--part",
+        dest="parts",
+        action="append",
+        type=int,
+        choices=sorted(PARTS),
+        help="part to run, may be repeated (default both)",
+    )
+    parser.add_argument(
+        "-m", "--module", help="only run modules whose file name contains this"
+    )
+    parser.add_argument(
+        "-s",
+        "--scales",
+        type=parse_scales,
+        default=list(DEFAULT_SCALES),
+        help="comma separated input scales (default 1,2,5,10,20,50,100)",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="seconds per part, larger scales are skipped after a failure",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        dest="trace_memory",
+        action="store_true",
+        help="also measure tracemalloc peaks (runs every part twice)",
+    )
+    parser.add_argument(
+        "--keep-inputs",
+        type=pathlib.Path,
+        help="write the generated inputs here instead of a temporary directory",
+    )
+    parser.add_argument("-f", "--format", choices=("text", "json"), default="text")
+    parser.add_argument("-o", "--output", type=pathlib.Path, help="report file")
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    day_modules = [
+        day_module
+        for day_module in select_day_modules(
+            discover_day_modules(), args.days, args.module
+        )
+        if day_module.day in GENERATORS
+    ]
+    if not day_modules:
+        print("No day modules with an input generator selected", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = args.keep_inputs or pathlib.Path(temporary_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        curves = [
+            curve
+            for day_module in day_modules
+            for curve in benchmark_day_module(
+                day_module,
+                args.parts or sorted(PARTS),
+                args.scales,
+                directory.resolve(),
+                args.seed,
+                args.trace_memory,
+                args.timeout,
+            )
+        ]
+
+    write_report = write_json if args.format == "json" else write_text
+    if args.output:
+        with open(args.output, "w") as output:
+            write_report(curves, output)
+    else:
+        write_report(curves, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,27 @@
-from typing import Iterator
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Counter, Iterable, Iterator, Optional
+from dataclasses import dataclass, field
+import array
+import collections
+import heapq
+import operator
+import importlib.util
+import itertools
+import os
+import pathlib
 
+from loader import stream_data
+from parse_cache import load_parsed
 
-TEST_FILENAME = "day1_testdata.txt"
-FILENAME = "day1_data.txt"
+if TYPE_CHECKING:
+    import numpy
 
 
-def yield_data(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+TEST_FILENAME = "day1_testdata.txt"
+FILENAME = "day1_data.txt"
+RUN_TYPECODE = "q"
+RUN_READ_SIZE = 1 << 14
+EXTERNAL_SORT_CHUNK_SIZE = 1 << 20
+EXTERNAL_SORT_MIN_BYTES = 256 << 20
 
 
 @dataclass(frozen=True, order=True)
@@ -20,13 +32,67 @@ class LocationId:
         return abs(self.value - other.value)
 
 
+# Each group kept as a multiset of values, with the similarity total kept
+# alongside it, so an id is added or removed in O(1) and sorting waits until
+# a distance is asked for.
+@dataclass()
+class LocationIndex:
+    counts: list[Counter[int]]
+    similarity: int = 0
+
+    def add(self, group_index: int, value: int) -> None:
+        self.update(group_index, value, 1)
+        return None
+
+    def remove(self, group_index: int, value: int) -> None:
+        counts = self.counts[group_index]
+        if not counts[value]:
+            raise ValueError(f"Location id {value} is not in group {group_index + 1}")
+        self.update(group_index, value, -1)
+        if not counts[value]:
+            del counts[value]
+        return None
+
+    def update(self, group_index: int, value: int, change: int) -> None:
+        other_counts = self.counts[1 - group_index]
+        self.similarity += value * change * other_counts[value]
+        self.counts[group_index][value] += change
+        return None
+
+    def sorted_group(self, group_index: int) -> Iterator[int]:
+        for value, count in sorted(self.counts[group_index].items()):
+            yield from itertools.repeat(value, count)
+
+
+def create_location_index(groups: Iterable[Iterable[int]]) -> LocationIndex:
+    counts1, counts2 = (collections.Counter(group) for group in groups)
+    similarity = sum(value * count * counts2[value] for value, count in counts1.items())
+    return LocationIndex([counts1, counts2], similarity)
+
+
 @dataclass()
 class LocationIds:
     groups: list[list[LocationId]]
+    index: LocationIndex = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.index = create_location_index(
+            (location_id.value for location_id in group) for group in self.groups
+        )
+
+    def add_location_id(self, group_index: int, location_id: LocationId) -> None:
+        self.index.add(group_index, location_id.value)
+        return None
+
+    def remove_location_id(self, group_index: int, location_id: LocationId) -> None:
+        self.index.remove(group_index, location_id.value)
+        return None
 
     def sort_groups(self) -> None:
-        for group in self.groups:
-            group.sort()
+        self.groups = [
+            [LocationId(value) for value in self.index.sorted_group(group_index)]
+            for group_index in range(len(self.groups))
+        ]
 
     def distances(self) -> Iterator[int]:
         for id1, id2 in zip(*self.groups):
@@ -37,12 +103,7 @@ class LocationIds:
         return sum(self.distances())
 
     def similarity_score(self) -> int:
-        location_ids1, location_ids2 = self.groups
-        score: int = 0
-        for location_id in location_ids1:
-            count = location_ids2.count(location_id)
-            score += location_id.value * count
-        return score
+        return self.index.similarity
 
     def __repr__(self):
         row: list[str] = []
@@ -53,6 +114,121 @@ class LocationIds:
         return "\n".join(row)
 
 
+@dataclass()
+class CompactLocationIds:
+    groups: list[array.array]
+    index: Optional[LocationIndex] = field(default=None, repr=False)
+
+    def location_index(self) -> LocationIndex:
+        if self.index is None:
+            self.index = create_location_index(self.groups)
+        return self.index
+
+    def add_location_id(self, group_index: int, value: int) -> None:
+        self.location_index().add(group_index, value)
+        return None
+
+    def remove_location_id(self, group_index: int, value: int) -> None:
+        self.location_index().remove(group_index, value)
+        return None
+
+    def sort_groups(self) -> None:
+        if self.index is not None:
+            self.groups = [
+                array.array(RUN_TYPECODE, self.index.sorted_group(group_index))
+                for group_index in range(len(self.groups))
+            ]
+            return None
+        self.groups = [
+            array.array(RUN_TYPECODE, sorted(group)) for group in self.groups
+        ]
+        return None
+
+    def total_distance(self) -> int:
+        group1, group2 = self.groups
+        return sum(map(abs, map(operator.sub, group1, group2)))
+
+    def similarity_score(self) -> int:
+        if self.index is not None:
+            return self.index.similarity
+        group1, group2 = self.groups
+        counts2 = collections.Counter(group2)
+        return sum(map(operator.mul, group1, map(counts2.__getitem__, group1)))
+
+
+def create_compact_location_ids(data: Iterator[str]) -> CompactLocationIds:
+    values = array.array(RUN_TYPECODE, map(int, " ".join(data).split()))
+    if len(values) % 2:
+        raise ValueError("Each row needs two location ids")
+    return CompactLocationIds(groups=[values[0::2], values[1::2]])
+
+
+@dataclass()
+class ArrayLocationIds:
+    groups: list["numpy.ndarray"]
+    index: Optional[LocationIndex] = field(default=None, repr=False)
+
+    def location_index(self) -> LocationIndex:
+        if self.index is None:
+            self.index = create_location_index(map(int, group) for group in self.groups)
+        return self.index
+
+    def add_location_id(self, group_index: int, value: int) -> None:
+        self.location_index().add(group_index, value)
+        return None
+
+    def remove_location_id(self, group_index: int, value: int) -> None:
+        self.location_index().remove(group_index, value)
+        return None
+
+    def sort_groups(self) -> None:
+        import numpy
+
+        if self.index is not None:
+            self.groups = [
+                numpy.fromiter(self.index.sorted_group(group_index), numpy.int64)
+                for group_index in range(len(self.groups))
+            ]
+            return None
+        for group in self.groups:
+            group.sort()
+        return None
+
+    def total_distance(self) -> int:
+        import numpy
+
+        group1, group2 = self.groups
+        return int(numpy.abs(group1 - group2).sum())
+
+    def similarity_score(self) -> int:
+        import numpy
+
+        if self.index is not None:
+            return self.index.similarity
+        group1, group2 = self.groups
+        values, counts = numpy.unique(group2, return_counts=True)
+        if not len(values):
+            return 0
+        indexes = numpy.searchsorted(values, group1).clip(0, len(values) - 1)
+        matches = values[indexes] == group1
+        return int((group1[matches] * counts[indexes[matches]]).sum())
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def create_array_location_ids(data: Iterator[str]) -> ArrayLocationIds:
+    import numpy
+
+    rows = list(data)
+    values = numpy.array(" ".join(rows).split(), dtype=numpy.int64)
+    if len(values) != 2 * len(rows):
+        raise ValueError("Each row needs two location ids")
+    columns = values.reshape(-1, 2)
+    return ArrayLocationIds(groups=[columns[:, 0].copy(), columns[:, 1].copy()])
+
+
 def create_location_ids(data: Iterator[str]) -> "LocationIds":
     group1: list["LocationId"] = []
     group2: list["LocationId"] = []
@@ -64,16 +240,126 @@ def create_location_ids(data: Iterator[str]) -> "LocationIds":
     return location_ids
 
 
+def write_sorted_run(values: array.array, path: pathlib.Path) -> None:
+    with open(path, "wb") as write_file:
+        array.array(RUN_TYPECODE, sorted(values)).tofile(write_file)
+
+
+def read_sorted_run(
+    path: pathlib.Path, read_size: int = RUN_READ_SIZE
+) -> Iterator[int]:
+    with open(path, "rb") as read_file:
+        while True:
+            values = array.array(RUN_TYPECODE)
+            try:
+                values.fromfile(read_file, read_size)
+            except EOFError:
+                yield from values
+                return
+            yield from values
+
+
+def value_counts(values: Iterator[int]) -> Iterator[tuple[int, int]]:
+    for value, group in itertools.groupby(values):
+        yield value, sum(1 for _ in group)
+
+
+@dataclass()
+class ExternalLocationIds:
+    runs: list[list[pathlib.Path]]
+
+    def merged_group(self, index: int) -> Iterator[int]:
+        return heapq.merge(*(read_sorted_run(path) for path in self.runs[index]))
+
+    def sort_groups(self) -> None:
+        return None
+
+    def total_distance(self) -> int:
+        return sum(
+            abs(id1 - id2)
+            for id1, id2 in zip(self.merged_group(0), self.merged_group(1))
+        )
+
+    def similarity_score(self) -> int:
+        counts2 = value_counts(self.merged_group(1))
+        value2, count2 = next(counts2, (None, 0))
+        score = 0
+        for value1, count1 in value_counts(self.merged_group(0)):
+            while value2 is not None and value2 < value1:
+                value2, count2 = next(counts2, (None, 0))
+            if value2 == value1:
+                score += value1 * count1 * count2
+        return score
+
+
+def spill_sorted_runs(
+    chunks: list[array.array],
+    runs: list[list[pathlib.Path]],
+    directory: pathlib.Path,
+) -> None:
+    for index, chunk in enumerate(chunks):
+        path = directory / f"group{index + 1}_run{len(runs[index])}.bin"
+        write_sorted_run(chunk, path)
+        runs[index].append(path)
+        del chunk[:]
+    return None
+
+
+def create_external_location_ids(
+    data: Iterator[str],
+    directory: pathlib.Path,
+    chunk_size: Optional[int] = None,
+) -> ExternalLocationIds:
+    chunk_size = chunk_size or EXTERNAL_SORT_CHUNK_SIZE
+    runs: list[list[pathlib.Path]] = [[], []]
+    chunks = [array.array(RUN_TYPECODE), array.array(RUN_TYPECODE)]
+    for location_data in data:
+        group1_id, group2_id = location_data.split()
+        chunks[0].append(int(group1_id))
+        chunks[1].append(int(group2_id))
+        if len(chunks[0]) >= chunk_size:
+            spill_sorted_runs(chunks, runs, directory)
+    if chunks[0]:
+        spill_sorted_runs(chunks, runs, directory)
+    return ExternalLocationIds(runs=runs)
+
+
+def use_external_sort(filename: str) -> bool:
+    return os.path.getsize(filename) >= EXTERNAL_SORT_MIN_BYTES
+
+
+def load_location_ids() -> CompactLocationIds | ArrayLocationIds:
+    if numpy_available():
+        return load_parsed(FILENAME, create_array_location_ids)
+    return load_parsed(FILENAME, create_compact_location_ids)
+
+
 def part_one():
-    data = yield_data(FILENAME)
-    location_ids = create_location_ids(data)
+    if use_external_sort(FILENAME):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            external_location_ids = create_external_location_ids(
+                stream_data(FILENAME), pathlib.Path(directory)
+            )
+            return external_location_ids.total_distance()
+
+    location_ids = load_location_ids()
     location_ids.sort_groups()
     return location_ids.total_distance()
 
 
 def part_two():
-    data = yield_data(FILENAME)
-    location_ids = create_location_ids(data)
+    if use_external_sort(FILENAME):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            external_location_ids = create_external_location_ids(
+                stream_data(FILENAME), pathlib.Path(directory)
+            )
+            return external_location_ids.similarity_score()
+
+    location_ids = load_location_ids()
     return location_ids.similarity_score()
 
 
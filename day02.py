@@ -1,9 +1,23 @@
-from typing import Iterator
+from typing import TYPE_CHECKING, Iterator, Optional, TextIO
 import dataclasses
 import enum
+import importlib.util
+import os
+
+from loader import stream_data
+from parse_cache import load_parsed
+
+if TYPE_CHECKING:
+    import numpy
+    import random
 
 
 FILENAME = "day02_data.txt"
+MIN_STEP = 1
+MAX_STEP = 3
+DIRECTIONS = (1, -1)
+NO_UNSAFE_STEP = -1
+STREAMING_MIN_BYTES = 256 << 20
 
 
 class LevelChange(enum.Enum):
@@ -12,12 +26,6 @@ class LevelChange(enum.Enum):
     SAME = "="
 
 
-def yield_data(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 @dataclasses.dataclass()
 class Report:
     levels: list[int] = dataclasses.field(default_factory=list)
@@ -67,17 +75,97 @@ class Report:
             ],
         )
 
-    def is_dampened_safe(self) -> bool:
-        if self.is_safe():
-            # print(f"safe without removing any level: {self.levels}")
+    def is_dampened_safe(self, tolerance: int = 1) -> bool:
+        return levels_are_safe(self.levels, tolerance)
+
+
+def levels_are_safe(levels: list[int], tolerance: int = 0) -> bool:
+    if tolerance > 1:
+        return any(
+            fewest_removals(levels, direction, tolerance) <= tolerance
+            for direction in DIRECTIONS
+        )
+    for direction in DIRECTIONS:
+        unsafe_index = first_unsafe_step(levels, direction)
+        if unsafe_index == NO_UNSAFE_STEP:
+            return True
+        if tolerance and any(
+            first_unsafe_step(levels, direction, skip_index) == NO_UNSAFE_STEP
+            for skip_index in (unsafe_index, unsafe_index + 1)
+        ):
             return True
-        for location, remove_level in enumerate(self.levels):
-            report = Report(self.levels[:location] + self.levels[location + 1 :])
-            if report.is_safe():
-                # print(f"safe after removing {remove_level}: {report.levels}")
-                return True
-        # print(f"not safe after removing any level: {self.levels}")
-        return False
+    return False
+
+
+def is_safe_step(level: int, next_level: int, direction: int) -> bool:
+    return MIN_STEP <= (next_level - level) * direction <= MAX_STEP
+
+
+def first_unsafe_step(levels: list[int], direction: int, skip_index: int = -1) -> int:
+    previous_index = NO_UNSAFE_STEP
+    for index, level in enumerate(levels):
+        if index == skip_index:
+            continue
+        if previous_index != NO_UNSAFE_STEP and not is_safe_step(
+            levels[previous_index], level, direction
+        ):
+            return previous_index
+        previous_index = index
+    return NO_UNSAFE_STEP
+
+
+def fewest_removals(levels: list[int], direction: int, tolerance: int) -> int:
+    too_many = tolerance + 1
+    removals: list[int] = []
+    fewest_total = too_many
+    for index, level in enumerate(levels):
+        fewest = index if index <= tolerance else too_many
+        for previous_index in range(max(0, index - too_many), index):
+            candidate = removals[previous_index] + index - previous_index - 1
+            if candidate < fewest and is_safe_step(
+                levels[previous_index], level, direction
+            ):
+                fewest = candidate
+        removals.append(fewest)
+        fewest_total = min(fewest_total, fewest + len(levels) - 1 - index)
+    return fewest_total
+
+
+def random_levels(rng: "random.Random") -> list[int]:
+    direction = rng.choice(DIRECTIONS)
+    levels = [rng.randint(1, 20)]
+    for _ in range(rng.randint(0, 8)):
+        levels.append(levels[-1] + direction * rng.randint(MIN_STEP, MAX_STEP))
+    for _ in range(rng.randint(0, 3)):
+        if levels:
+            levels[rng.randrange(len(levels))] += rng.randint(-4, 4)
+    return levels
+
+
+# No puzzle answer uses a tolerance above one, so the dynamic programme in
+# fewest_removals is checked against trying every set of removals instead.
+def cross_check(samples: int = 2000, seed: int = 2024) -> Iterator[str]:
+    import itertools
+    import random
+
+    rng = random.Random(seed)
+    for _ in range(samples):
+        levels = random_levels(rng)
+        for tolerance in range(4):
+            expected = any(
+                levels_are_safe(
+                    [
+                        level
+                        for index, level in enumerate(levels)
+                        if index not in removed
+                    ]
+                )
+                for count in range(tolerance + 1)
+                for removed in itertools.combinations(range(len(levels)), count)
+            )
+            if levels_are_safe(levels, tolerance) != expected:
+                yield f"levels_are_safe({levels}, {tolerance}) is not {expected}"
+    return None
 
 
 @dataclasses.dataclass()
@@ -87,8 +175,60 @@ class Reports:
     def safe_report_count(self) -> int:
         return len([report for report in self.report if report.is_safe()])
 
-    def dampened_safe_report_count(self) -> int:
-        return len([report for report in self.report if report.is_dampened_safe()])
+    def dampened_safe_report_count(self, tolerance: int = 1) -> int:
+        return len(
+            [report for report in self.report if report.is_dampened_safe(tolerance)]
+        )
+
+
+@dataclasses.dataclass()
+class ReportBatch:
+    values: "numpy.ndarray"
+    offsets: "numpy.ndarray"
+
+    def step_counts(self) -> "numpy.ndarray":
+        import numpy
+
+        return numpy.maximum(numpy.diff(self.offsets) - 1, 0)
+
+    def unsafe_step_counts(self, direction: int) -> "numpy.ndarray":
+        import numpy
+
+        steps = numpy.diff(self.values) * direction
+        unsafe_steps = (steps < MIN_STEP) | (steps > MAX_STEP)
+        unsafe_totals = numpy.concatenate(([0], numpy.cumsum(unsafe_steps)))
+        starts = self.offsets[:-1]
+        return unsafe_totals[starts + self.step_counts()] - unsafe_totals[starts]
+
+    def safe_mask(self) -> "numpy.ndarray":
+        import numpy
+
+        if not len(self.values):
+            return numpy.ones(len(self.offsets) - 1, dtype=bool)
+        return numpy.logical_or.reduce(
+            [self.unsafe_step_counts(direction) == 0 for direction in DIRECTIONS]
+        )
+
+    def safe_report_count(self) -> int:
+        return int(self.safe_mask().sum())
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def create_report_batch(data: Iterator[str]) -> ReportBatch:
+    import numpy
+
+    lines = list(data)
+    lengths = numpy.fromiter(
+        (len(line.split()) for line in lines), dtype=numpy.int64, count=len(lines)
+    )
+    values = numpy.array(" ".join(lines).split(), dtype=numpy.int64)
+    if len(values) != lengths.sum():
+        raise ValueError("Report levels do not add up to the report lengths")
+    offsets = numpy.concatenate(([0], numpy.cumsum(lengths)))
+    return ReportBatch(values, offsets)
 
 
 def create_reports(data: Iterator[str]) -> Reports:
@@ -99,15 +239,51 @@ def create_reports(data: Iterator[str]) -> Reports:
     return reports
 
 
+@dataclasses.dataclass()
+class ReportTally:
+    reports: int = 0
+    safe: int = 0
+    dampened_safe: int = 0
+
+
+def validate_reports(
+    data: Iterator[str], tolerance: int = 1, unsafe_sink: Optional[TextIO] = None
+) -> ReportTally:
+    tally = ReportTally()
+    for index, report_data in enumerate(data):
+        levels = [int(level) for level in report_data.split()]
+        tally.reports += 1
+        if levels_are_safe(levels):
+            tally.safe += 1
+            tally.dampened_safe += 1
+            continue
+        dampened_safe = levels_are_safe(levels, tolerance)
+        if dampened_safe:
+            tally.dampened_safe += 1
+        if unsafe_sink:
+            status = "dampened_safe" if dampened_safe else "unsafe"
+            unsafe_sink.write(f"{index} {status}\n")
+    return tally
+
+
+def use_streaming(filename: str) -> bool:
+    return os.path.getsize(filename) >= STREAMING_MIN_BYTES
+
+
 def part_one():
-    data = yield_data(FILENAME)
-    reports = create_reports(data)
+    if use_streaming(FILENAME):
+        return validate_reports(stream_data(FILENAME)).safe
+    if numpy_available():
+        report_batch = load_parsed(FILENAME, create_report_batch)
+        return report_batch.safe_report_count()
+    reports = load_parsed(FILENAME, create_reports)
     return reports.safe_report_count()
 
 
 def part_two():
-    data = yield_data(FILENAME)
-    reports = create_reports(data)
+    if use_streaming(FILENAME):
+        return validate_reports(stream_data(FILENAME)).dampened_safe
+    reports = load_parsed(FILENAME, create_reports)
     return reports.dampened_safe_report_count()
 
 
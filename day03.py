@@ -1,18 +1,22 @@
-from typing import Iterator
+from typing import Callable, Iterable, Iterator, Union
+import collections
 import dataclasses
 from enum import Enum
+import functools
+import mmap
+import os
+import re
 import string
 
+from loader import Span, find_line_spans, load_input, yield_data
+
 
 FILENAME = "day03_data.txt"
 
 
 def yield_characters(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            striped_line = line.strip()
-            for character in striped_line:
-                yield character
+    for line in yield_data(filename):
+        yield from line
 
 
 DIGITS = string.digits
@@ -20,6 +24,101 @@ OPEN_BRACKET = "("
 CLOSE_BRACKET = ")"
 SEPERATOR = ","
 
+PARALLEL_MIN_BYTES = 32 << 20
+CHUNK_SIZE = 4 << 20
+
+
+@dataclasses.dataclass(frozen=True)
+class Instruction:
+    name: str
+    operand_count: int
+    execute: Callable[["MemoryScanner", list[int]], None]
+    needs_enabled: bool = False
+    needs_conditional: bool = False
+
+    def is_active(self, use_conditional: bool, enabled: bool) -> bool:
+        return (enabled or not self.needs_enabled) and (
+            use_conditional or not self.needs_conditional
+        )
+
+
+def multiply(memory_scanner: "MemoryScanner", operands: list[int]) -> None:
+    memory_scanner.total += operands[0] * operands[1]
+    return None
+
+
+def enable(memory_scanner: "MemoryScanner", operands: list[int]) -> None:
+    memory_scanner.enabled = True
+    return None
+
+
+def disable(memory_scanner: "MemoryScanner", operands: list[int]) -> None:
+    memory_scanner.enabled = False
+    return None
+
+
+INSTRUCTIONS: tuple[Instruction, ...] = (
+    Instruction("mul", 2, multiply, needs_enabled=True),
+    Instruction("do", 0, enable, needs_conditional=True),
+    Instruction("don't", 0, disable, needs_conditional=True),
+)
+PREFIX_SIZE = max(len(instruction.name) for instruction in INSTRUCTIONS)
+
+
+# An instruction without operands runs on whatever character follows its
+# "(", like MemoryPart.DO and MemoryPart.DONT, so only the end can stop it.
+def operands_pattern(operand_count: int) -> bytes:
+    if not operand_count:
+        return rb"((?s:.))?"
+    return rb"(?:" + rb",".join([rb"(\d*)"] * operand_count) + rb"\))?"
+
+
+@functools.cache
+def partial_operands(operand_count: int) -> re.Pattern[bytes]:
+    if not operand_count:
+        return re.compile(rb"")
+    return re.compile(rb"\d*(?:,\d*){0,%d}" % (operand_count - 1))
+
+
+@dataclasses.dataclass(frozen=True)
+class InstructionAutomaton:
+    pattern: re.Pattern[bytes]
+    hits: dict[int, tuple[Instruction, slice]]
+    rejects: dict[int, tuple[Instruction, re.Pattern[bytes]]]
+
+
+# A single alternation of every active instruction finds the next one
+# without stopping at each "(" in between. Names cannot hold a bracket, so a
+# match never reaches back past a reset, and the leftmost match picks the
+# longest name when one name ends another. Names lead their alternatives so
+# re can skip ahead on their first letters, and the last group that matched
+# tells which instruction it was and whether its operands were complete.
+def compile_instructions(
+    instructions: Iterable[Instruction], use_conditional: bool, enabled: bool
+) -> InstructionAutomaton:
+    alternatives: list[bytes] = []
+    hits: dict[int, tuple[Instruction, slice]] = {}
+    rejects: dict[int, tuple[Instruction, re.Pattern[bytes]]] = {}
+    group = 1
+    for instruction in instructions:
+        if not instruction.is_active(use_conditional, enabled):
+            continue
+        if OPEN_BRACKET in instruction.name or CLOSE_BRACKET in instruction.name:
+            raise ValueError(f"Invalid instruction name: {instruction.name!r}")
+        operand_count = instruction.operand_count
+        alternatives.append(
+            re.escape(instruction.name.encode())
+            + rb"(\()"
+            + operands_pattern(operand_count)
+        )
+        rejects[group] = instruction, partial_operands(operand_count)
+        hits[group + max(operand_count, 1)] = instruction, slice(
+            group, group + operand_count
+        )
+        group += max(operand_count, 1) + 1
+    pattern = b"|".join(alternatives) if alternatives else rb"(?!)"
+    return InstructionAutomaton(re.compile(pattern), hits, rejects)
+
 
 class MemoryPart(Enum):
     PREFIX = 1
@@ -29,21 +128,30 @@ class MemoryPart(Enum):
     DONT = 5
 
 
+def create_letters() -> collections.deque[str]:
+    return collections.deque(maxlen=PREFIX_SIZE)
+
+
+# Only the last PREFIX_SIZE letters can match an instruction, so the ring
+# drops older ones instead of growing with every letter of a garbage run.
 @dataclasses.dataclass
 class Prefix:
-    letters: list[str] = dataclasses.field(default_factory=list)
+    letters: collections.deque[str] = dataclasses.field(default_factory=create_letters)
 
     def add_letter(self, letter: str) -> None:
         self.letters.append(letter)
 
+    def ends_with(self, word: str) -> bool:
+        return "".join(self.letters).endswith(word)
+
     def is_mul(self) -> bool:
-        return self.letters[-3:] == ["m", "u", "l"]
+        return self.ends_with("mul")
 
     def is_do(self) -> bool:
-        return self.letters[-2:] == ["d", "o"]
+        return self.ends_with("do")
 
     def is_dont(self) -> bool:
-        return self.letters[-5:] == ["d", "o", "n", "'", "t"]
+        return self.ends_with("don't")
 
 
 @dataclasses.dataclass
@@ -114,22 +222,152 @@ class MemoryParser:
                 self.reset()
 
 
-def part_one() -> int:
-    characters = yield_characters(FILENAME)
-    memory_parser = MemoryParser()
-    for character in characters:
-        memory_parser.add_character(character)
+def load_memory(filename: str) -> bytes:
+    input_file = load_input(filename)
+    return b"".join(
+        input_file.buffer[start:end] for start, end in input_file.line_spans
+    )
 
-    return memory_parser.total
 
+# Scans a whole buffer with the same quirks as MemoryParser: a prefix only
+# counts back to the last reset, and the character ending a bad instruction
+# or following one without operands is consumed.
+@dataclasses.dataclass
+class MemoryScanner:
+    use_conditional: bool = False
+    enabled: bool = True
+    total: int = 0
+    instructions: tuple[Instruction, ...] = dataclasses.field(
+        default=INSTRUCTIONS, repr=False
+    )
+    hits: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    rejects: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    def __post_init__(self) -> None:
+        self.automata = {
+            enabled: compile_instructions(
+                self.instructions, self.use_conditional, enabled
+            )
+            for enabled in (True, False)
+        }
+
+    def scan(self, memory: bytes) -> None:
+        automata = self.automata
+        automaton = automata[self.enabled]
+        hits = self.hits
+        start = 0
+        while match := automaton.pattern.search(memory, start):
+            group = match.lastindex
+            start = match.end()
+            if group in automaton.rejects:
+                instruction, operands = automaton.rejects[group]
+                self.rejects[instruction.name] += 1
+                start = operands.match(memory, start).end() + 1
+                continue
+            instruction, operand_groups = automaton.hits[group]
+            hits[instruction.name] += 1
+            instruction.execute(self, list(map(int, match.groups()[operand_groups])))
+            automaton = automata[self.enabled]
+        return None
+
+
+# The parser is back in its prefix state after any ")", so chunks cut just
+# after one scan independently; only the enabled flag crosses the cut.
+def find_chunk_spans(buffer: mmap.mmap, chunk_size: int = CHUNK_SIZE) -> list[Span]:
+    chunk_spans: list[Span] = []
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b")", start + chunk_size - 1) + 1 or len(buffer)
+        chunk_spans.append((start, end))
+        start = end
+    return chunk_spans
+
+
+def read_memory_chunk(filename: str, chunk_span: Span) -> bytes:
+    start, end = chunk_span
+    with open(filename, "rb") as read_file:
+        read_file.seek(start)
+        chunk = read_file.read(end - start)
+    return b"".join(
+        chunk[line_start:line_end] for line_start, line_end in find_line_spans(chunk)
+    )
+
+
+ChunkScan = dict[bool, Union[MemoryScanner, ValueError]]
+
+
+def scan_chunk(filename: str, chunk_span: Span, use_conditional: bool) -> ChunkScan:
+    memory = read_memory_chunk(filename, chunk_span)
+    # Without knowing how earlier chunks end, scan from both enabled states.
+    # A bad number only matters if the merge picks the state that hit it.
+    chunk_scan: ChunkScan = {}
+    for enabled in (True, False) if use_conditional else (True,):
+        memory_scanner = MemoryScanner(use_conditional, enabled)
+        try:
+            memory_scanner.scan(memory)
+        except ValueError as error:
+            chunk_scan[enabled] = error
+            continue
+        chunk_scan[enabled] = memory_scanner
+    return chunk_scan
+
+
+def merge_chunk_scans(
+    chunk_scans: Iterable[ChunkScan], use_conditional: bool
+) -> MemoryScanner:
+    merged = MemoryScanner(use_conditional)
+    for chunk_scan in chunk_scans:
+        chunk_scanner = chunk_scan[merged.enabled]
+        if isinstance(chunk_scanner, ValueError):
+            raise chunk_scanner
+        merged.total += chunk_scanner.total
+        merged.hits.update(chunk_scanner.hits)
+        merged.rejects.update(chunk_scanner.rejects)
+        merged.enabled = chunk_scanner.enabled
+    return merged
+
+
+def scan_parallel(
+    filename: str, use_conditional: bool, jobs: int = 0, chunk_size: int = CHUNK_SIZE
+) -> MemoryScanner:
+    import concurrent.futures
+
+    if not os.path.getsize(filename):
+        return MemoryScanner(use_conditional)
+    with open(filename, "rb") as read_file:
+        with mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            chunk_spans = find_chunk_spans(buffer, chunk_size)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        chunk_scans = executor.map(
+            functools.partial(scan_chunk, filename, use_conditional=use_conditional),
+            chunk_spans,
+        )
+        return merge_chunk_scans(chunk_scans, use_conditional)
+
+
+def use_parallel(filename: str, jobs: int = 0) -> bool:
+    jobs = jobs or os.cpu_count() or 1
+    return jobs > 1 and os.path.getsize(filename) >= PARALLEL_MIN_BYTES
+
+
+def scan_memory(filename: str, use_conditional: bool) -> MemoryScanner:
+    if use_parallel(filename):
+        return scan_parallel(filename, use_conditional)
+    memory_scanner = MemoryScanner(use_conditional)
+    memory_scanner.scan(load_memory(filename))
+    return memory_scanner
+
+
+def part_one() -> int:
+    return scan_memory(FILENAME, use_conditional=False).total
 
-def part_two() -> int:
-    characters = yield_characters(FILENAME)
-    memory_parser = MemoryParser(use_conditional=True)
-    for character in characters:
-        memory_parser.add_character(character)
 
-    return memory_parser.total
+def part_two() -> int:
+    return scan_memory(FILENAME, use_conditional=True).total
 
 
 def main():
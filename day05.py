@@ -2,14 +2,10 @@ from typing import Iterator
 import dataclasses
 from collections import Counter
 
-
-FILENAME = "day05_data.txt"
+from parse_cache import load_parsed
 
 
-def yield_data(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day05_data.txt"
 
 
 Pages = list[int]
@@ -107,8 +103,7 @@ def create_safty_manual(data: Iterator[str]) -> SaftyManual:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    safty_manual = create_safty_manual(data)
+    safty_manual = load_parsed(FILENAME, create_safty_manual)
     score = 0
     for update in safty_manual.updates_in_correct_order():
         score += update.middle_page_number()
@@ -117,8 +112,7 @@ def part_one() -> int:
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    safty_manual = create_safty_manual(data)
+    safty_manual = load_parsed(FILENAME, create_safty_manual)
     safty_manual.fix_updates()
     score = 0
     for update in safty_manual.fixed_updates:
@@ -3,13 +3,17 @@ import dataclasses
 import enum
 import itertools
 
-FILENAME = "day06_data.txt"
-
+from geometry import (
+    Location,
+    LocationDirection,
+    NeighbourTable,
+    fit_neighbour_table,
+    turn_right,
+)
+from parse_cache import load_parsed
+from progress import create_progress
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day06_data.txt"
 
 
 class LocationType(enum.Enum):
@@ -24,40 +28,6 @@ class GaurdRouteExitState(enum.Enum):
     STUCK_IN_LOOP = enum.auto()
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
-def turn_right(location_direction: LocationDirection) -> LocationDirection:
-    match location_direction:
-        case LocationDirection.UP:
-            location_direction = LocationDirection.RIGHT
-        case LocationDirection.RIGHT:
-            location_direction = LocationDirection.DOWN
-        case LocationDirection.DOWN:
-            location_direction = LocationDirection.LEFT
-        case LocationDirection.LEFT:
-            location_direction = LocationDirection.UP
-        case _:
-            raise ValueError(f"Invalid type: {location_direction}")
-
-    return location_direction
-
-
 GUARD_DIRECTION_LABEL: dict[LocationDirection, str] = {
     LocationDirection.UP: "^",
     LocationDirection.RIGHT: ">",
@@ -95,6 +65,9 @@ class Grid:
     max_x_location: int = 0
     max_y_location: int = 0
     guard_location: typing.Optional[Location] = None
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_grid_location(self, grid_location: GridLocation) -> None:
         if grid_location.location_type in (
@@ -131,14 +104,16 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
+        )
+
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
         )
+        return self.neighbour_table
 
     def __str__(self) -> str:
         rows: list[str] = []
@@ -195,17 +170,18 @@ class GuardRoute:
         return set(gridlocation.location for gridlocation in self.grid_location_history)
 
     def patrol(self) -> GaurdRouteExitState:
+        neighbour_table = self.grid.get_neighbour_table()
         while True:
             current_grid_location = self.grid_location_history[-1]
             location = current_grid_location.location
             facing_direction = current_grid_location.facing_direction
             if not facing_direction:
                 raise ValueError("No facing direction found")
-            neighbourlocation = location.neighbour_location(facing_direction)
+            neighbourlocation = neighbour_table.neighbour(location, facing_direction)
+            if neighbourlocation is None:
+                return GaurdRouteExitState.OUT_OF_BOUNDS
             neighbour_grid_location = self.grid.get_grid_location(neighbourlocation)
             match neighbour_grid_location.location_type:
-                case LocationType.OUT_OF_BOUNDS:
-                    return GaurdRouteExitState.OUT_OF_BOUNDS
                 case LocationType.OBSTRUCTION:
                     facing_direction = turn_right(facing_direction)
                     new_grid_location = dataclasses.replace(
@@ -251,25 +227,26 @@ class FindLoopingGuardRoutes:
         self.grid.add_grid_location(new_guard_grid_location)
 
     def find_obstruction_locations(self, locations: set[Location]) -> None:
-        amount_of_locations = len(locations)
-        for index, location in enumerate(locations):
-            self.reset_guard()
-            grid_location = self.grid.get_grid_location(location)
-            if grid_location.location_type != LocationType.EMPTY:
-                continue
-            print(f"Trying location: {location} of {index} {amount_of_locations}")
-            obstruction_grid_location = GridLocation(location, LocationType.OBSTRUCTION)
-            self.grid.add_grid_location(obstruction_grid_location)
-            guard_route = GuardRoute(self.grid)
-            exit_state = guard_route.patrol()
-            if exit_state == GaurdRouteExitState.STUCK_IN_LOOP:
-                self.obstruction_locations.add(location)
-            self.grid.remove_grid_location(obstruction_grid_location)
+        with create_progress("obstruction locations", len(locations)) as progress:
+            for location in locations:
+                progress.advance()
+                self.reset_guard()
+                grid_location = self.grid.get_grid_location(location)
+                if grid_location.location_type != LocationType.EMPTY:
+                    continue
+                obstruction_grid_location = GridLocation(
+                    location, LocationType.OBSTRUCTION
+                )
+                self.grid.add_grid_location(obstruction_grid_location)
+                guard_route = GuardRoute(self.grid)
+                exit_state = guard_route.patrol()
+                if exit_state == GaurdRouteExitState.STUCK_IN_LOOP:
+                    self.obstruction_locations.add(location)
+                self.grid.remove_grid_location(obstruction_grid_location)
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     guard_route = GuardRoute(grid)
     exit_state = guard_route.patrol()
     print(exit_state)
@@ -277,14 +254,12 @@ def part_one() -> int:
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     guard_route = GuardRoute(grid)
     guard_route.patrol()
     locations = guard_route.distinct_visited_locations
 
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     find_looping_guard_routes = FindLoopingGuardRoutes(grid)
     find_looping_guard_routes.find_obstruction_locations(locations)
     return len(find_looping_guard_routes.obstruction_locations)
@@ -295,5 +270,5 @@ def main() -> None:
     print(f"Part two: {part_two()}")
 
 
- if __name__ == "__main__":
-     main()
+if __name__ == "__main__":
+    main()
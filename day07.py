@@ -4,14 +4,10 @@ import enum
 import itertools
 import functools
 
-
-FILENAME = "day07_data.txt"
+from parse_cache import load_parsed
 
 
-def yield_data(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day07_data.txt"
 
 
 class OperatorType(enum.Enum):
@@ -97,24 +93,26 @@ def create_calibration_equations(
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    calibration_equations = create_calibration_equations(
-        data, (OperatorType.ADD, OperatorType.MULTIPLY)
+    calibration_equations = load_parsed(
+        FILENAME,
+        create_calibration_equations,
+        (OperatorType.ADD, OperatorType.MULTIPLY),
     )
     return calibration_equations.total_calibration_result()
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    calibration_equations = create_calibration_equations(
-        data, (OperatorType.ADD, OperatorType.MULTIPLY, OperatorType.CONCATENATE)
+    calibration_equations = load_parsed(
+        FILENAME,
+        create_calibration_equations,
+        (OperatorType.ADD, OperatorType.MULTIPLY, OperatorType.CONCATENATE),
     )
     return calibration_equations.total_calibration_result()
 
 
 def main() -> None:
-    # print(f"Part one: {part_one()}")
-    # print(f"Part two: {part_two()}")
+    print(f"Part one: {part_one()}")
+    print(f"Part two: {part_two()}")
 
 
 if __name__ == "__main__":
@@ -1,19 +1,15 @@
 import dataclasses
 import enum
-from typing import Iterator
 import typing
 import string
 import collections
 import itertools
 
-
-FILENAME = "day08_data.txt"
+from geometry import Location
+from parse_cache import load_parsed
 
 
-def yield_data(filename: str) -> Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day08_data.txt"
 
 
 FREQUENCY_CHARACTERS = "".join(
@@ -34,18 +30,6 @@ class LocationCharacter(enum.Enum):
     ANTINODE = "#"
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def differance(self, other: "Location") -> "Location":
-        return Location(self.x - other.x, self.y - other.y)
-
-    def offset_by(self, differance: "Location") -> "Location":
-        return Location(self.x + differance.x, self.y + differance.y)
-
-
 @dataclasses.dataclass
 class GridLocation:
     location: Location
@@ -112,13 +96,9 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
         )
 
     def get_frequency_pairs(
@@ -218,15 +198,13 @@ def create_map(data: typing.Iterator[str]) -> Grid:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid = create_map(data)
+    grid = load_parsed(FILENAME, create_map)
     grid.create_antinodes()
     return len(grid.antinode_grid_locations)
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    grid = create_map(data)
+    grid = load_parsed(FILENAME, create_map)
     grid.create_antinodes(True)
     return len(grid.antinode_grid_locations)
 
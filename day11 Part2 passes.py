@@ -1,14 +1,10 @@
 import dataclasses
 import typing
 
-
-FILENAME = "day11_data.txt"
+from parse_cache import load_parsed
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day11_data.txt"
 
 
 @dataclasses.dataclass(slots=True)
@@ -76,16 +72,14 @@ def create_stones(data: typing.Iterator[str]) -> Stones:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    stones = create_stones(data)
+    stones = load_parsed(FILENAME, create_stones)
     for _ in range(25):
         stones.blink()
     return stones.stone_qty()
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    stones = create_stones(data)
+    stones = load_parsed(FILENAME, create_stones)
     for _ in range(75):
         stones.blink()
     return stones.stone_qty()
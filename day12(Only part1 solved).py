@@ -1,42 +1,27 @@
 import dataclasses
 import enum
 import typing
-import collections
+
+from geometry import (
+    Location,
+    NeighbourTable,
+    fit_neighbour_table,
+    id_location,
+    location_id,
+)
+from parse_cache import load_parsed
+from search import breadth_first_search
 
 
 TEST_FILENAME = "day12_testdata.txt"
 FILENAME = "day12_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 class LocationType(enum.Enum):
     PLANT = enum.auto()
     OUT_OF_BOUNDS = enum.auto()
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 @dataclasses.dataclass(slots=True, frozen=True)
 class GridLocation:
     location: Location
@@ -59,6 +44,9 @@ class Grid:
     )
     max_x_location: int = 0
     max_y_location: int = 0
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_grid_location(self, grid_location: GridLocation) -> None:
         self.grid_locations[(grid_location.x, grid_location.y)] = grid_location
@@ -66,6 +54,10 @@ class Grid:
 
         return None
 
+    @property
+    def width(self) -> int:
+        return self.max_x_location + 1
+
     def update_max_values(self, location: Location) -> None:
         self.max_x_location = max(self.max_x_location, location.x)
         self.max_y_location = max(self.max_y_location, location.y)
@@ -81,14 +73,16 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
+        )
+
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
         )
+        return self.neighbour_table
 
     def __str__(self) -> str:
         rows: list[str] = []
@@ -130,15 +124,17 @@ class Region:
 
     @property
     def perimeter(self) -> int:
+        neighbour_table = self.grid.get_neighbour_table()
         score = 0
         for grid_location in self.grid_locations:
-            for location_direction in LocationDirection:
-                location = grid_location.location
-                neighbour_location = location.neighbour_location(location_direction)
-                neighbour_grid_location = self.grid.get_grid_location(
-                    neighbour_location
-                )
-                if neighbour_grid_location.label != self.label:
+            for neighbour_location in neighbour_table.all_neighbours(
+                grid_location.location
+            ):
+                if (
+                    neighbour_location is None
+                    or self.grid.get_grid_location(neighbour_location).label
+                    != self.label
+                ):
                     score += 1
         return score
     
@@ -156,23 +152,29 @@ class Region:
     def locations(self) -> set[Location]:
         return {grid_location.location for grid_location in self.grid_locations}
 
+    def plant_neighbours(self, node: int) -> typing.Iterator[int]:
+        width = self.grid.width
+        location = id_location(node, width)
+        for neighbour_location in self.grid.get_neighbour_table().all_neighbours(
+            location
+        ):
+            if (
+                neighbour_location is not None
+                and self.grid.get_grid_location(neighbour_location).label
+                == self.label
+            ):
+                yield location_id(neighbour_location, width)
+
     def find_grid_locations(self, start_location: Location) -> None:
+        width = self.grid.width
         grid_location = self.grid.get_grid_location(start_location)
         self.grid_locations.append(grid_location)
-        queue = collections.deque([grid_location])
-        while queue:
-            grid_location = queue.popleft()
-            location = grid_location.location
-            for location_direction in LocationDirection:
-                neighbour_location = location.neighbour_location(location_direction)
-                neighbour_grid_location = self.grid.get_grid_location(
-                    neighbour_location
-                )
-                if neighbour_grid_location in self.grid_locations:
-                    continue
-                if neighbour_grid_location.label == self.label:
-                    self.grid_locations.append(neighbour_grid_location)
-                    queue.append(neighbour_grid_location)
+        result = breadth_first_search(
+            None, location_id(start_location, width), self.plant_neighbours
+        )
+        for node in result.order[1:]:
+            location = id_location(node, width)
+            self.grid_locations.append(self.grid.get_grid_location(location))
 
     def __str__(self) -> str:
         return f"Label: {self.label}, Area: {self.area}, Perimeter: {self.perimeter}, Fence Price: {self.fence_price}"
@@ -204,16 +206,14 @@ class Regions:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     regions = Regions(grid)
     regions.find_regions()
     return regions.total_fence_price
 
 
 def part_two() -> int:
-    data = yield_data(TEST_FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(TEST_FILENAME, create_grid)
     regions = Regions(grid)
     regions.find_regions()
 
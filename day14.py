@@ -1,15 +1,19 @@
-import collections
 import enum
 import typing
 import dataclasses
 
-FILENAME = "day14_data.txt"
-
+from geometry import (
+    Location,
+    NeighbourTable,
+    fit_neighbour_table,
+    id_location,
+    location_id,
+)
+from parse_cache import load_parsed
+from progress import create_progress
+from search import breadth_first_search
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day14_data.txt"
 
 
 class LocationType(enum.Enum):
@@ -25,22 +29,6 @@ class Robot:
     time_step: int = 0
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def differance(self, other: "Location") -> "Location":
-        return Location(self.x - other.x, self.y - other.y)
-
-    def offset_by(self, differance: "Location") -> "Location":
-        return Location(self.x + differance.x, self.y + differance.y)
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-
 @dataclasses.dataclass(slots=True)
 class GridLocation:
     location: Location
@@ -86,6 +74,19 @@ class Grid:
         default_factory=dict
     )
     time_step: int = 0
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def width(self) -> int:
+        return self.max_x_location + 1
+
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.width, self.max_y_location + 1
+        )
+        return self.neighbour_table
 
     def remove_grid_location(self, grid_location: GridLocation) -> None:
         del self.grid_locations[(grid_location.x, grid_location.y)]
@@ -152,13 +153,9 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
         )
 
     def robots_in_quadrant(self, quadrant_no: int) -> list[Robot]:
@@ -234,14 +231,6 @@ def create_grid(data: typing.Iterator[str], width: int, height: int) -> Grid:
     return grid
 
 
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 @dataclasses.dataclass
 class Region:
     grid: Grid
@@ -251,55 +240,63 @@ class Region:
     def area(self) -> int:
         return len(self.grid_locations)
 
+    def robot_neighbours(self, node: int) -> typing.Iterator[int]:
+        width = self.grid.width
+        robot_locations = self.grid.grid_locations
+        location = id_location(node, width)
+        for neighbour_location in self.grid.get_neighbour_table().all_neighbours(
+            location
+        ):
+            if neighbour_location is None:
+                continue
+            if (neighbour_location.x, neighbour_location.y) in robot_locations:
+                yield location_id(neighbour_location, width)
+
     def find_grid_locations(self, start_location: Location) -> None:
-        grid_location = self.grid.get_grid_location(start_location)
-        self.grid_locations.append(grid_location)
-        queue = collections.deque([grid_location])
-        while queue:
-            grid_location = queue.popleft()
-            location = grid_location.location
-            for location_direction in LocationDirection:
-                neighbour_location = location.neighbour_location(location_direction)
-                neighbour_grid_location = self.grid.get_grid_location(
-                    neighbour_location
-                )
-                if neighbour_grid_location in self.grid_locations:
-                    continue
-                if neighbour_grid_location.location_type == LocationType.ROBOT:
-                    self.grid_locations.append(neighbour_grid_location)
-                    queue.append(neighbour_grid_location)
+        width = self.grid.width
+        result = breadth_first_search(
+            None, location_id(start_location, width), self.robot_neighbours
+        )
+        for node in result.order:
+            location = id_location(node, width)
+            self.grid_locations.append(self.grid.get_grid_location(location))
 
 
 def find_large_region(grid: Grid, size: int = 10) -> int:
     largest_region_found = 0
+    region_locations: set[Location] = set()
     for grid_location in grid.grid_locations.values():
+        if grid_location.location in region_locations:
+            continue
         region = Region(grid)
         region.find_grid_locations(grid_location.location)
+        region_locations.update(
+            grid_location.location for grid_location in region.grid_locations
+        )
         largest_region_found = max(largest_region_found, region.area)
 
     return largest_region_found
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data, 101, 103)
+    grid = load_parsed(FILENAME, create_grid, 101, 103)
     for _ in range(100):
         grid.move_robots()
     return grid.safety_factor()
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data, 101, 103)
+    grid = load_parsed(FILENAME, create_grid, 101, 103)
     max_region_found = 0
-    for index in range(10000):
-        grid.move_robots()
-        max_region_found = max(max_region_found, find_large_region(grid, 20))
-        print(f"{index}: {max_region_found=}")
-        if max_region_found > 16:
-            print(f"Found Christmas Tree {index}")
-            print(grid)
-            return index + 1  # off by 1 for some reason
+    with create_progress("seconds", 10000) as progress:
+        for index in range(10000):
+            grid.move_robots()
+            max_region_found = max(max_region_found, find_large_region(grid, 20))
+            progress.advance(max_region_found=max_region_found)
+            if max_region_found > 16:
+                print(f"Found Christmas Tree {index}")
+                print(grid)
+                return index + 1  # off by 1 for some reason
     print(grid)
     return 0
 
@@ -2,56 +2,23 @@ import dataclasses
 import enum
 import typing
 
+from geometry import Location, LocationDirection, NeighbourTable, fit_neighbour_table
+from loader import read_sections
+
 
 TEST_FILENAME = "day15_testdata.txt"
 FILENAME = "day15_data.txt"
 
-SPLITTER: typing.Final[str] = "S"
-
-
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            if line == "\n":
-                yield LocationType.SPLITTER.value
-            yield line.strip()
-
-
 class LocationType(enum.Enum):
     ROBOT = "@"
     EMPTY = "."
     BOX = "O"
     WALL = "#"
     OUT_OF_BOUNDS = "X"
-    SPLITTER = "S"
     BOX_LEFT = "["
     BOX_RIGHT = "]"
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    # def differance(self, other: "Location") -> "Location":
-    #     return Location(self.x - other.x, self.y - other.y)
-
-    # def offset_by(self, differance: "Location") -> "Location":
-    #     return Location(self.x + differance.x, self.y + differance.y)
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 DIRECTION: dict[str, LocationDirection] = {
     "^": LocationDirection.UP,
     ">": LocationDirection.RIGHT,
@@ -106,6 +73,9 @@ class Grid:
     max_x_location: int = 0
     max_y_location: int = 0
     robot_location: typing.Optional[Location] = None
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_grid_location(self, grid_location: GridLocation) -> None:
         if (grid_location.x, grid_location.y) in self.grid_locations:
@@ -209,15 +179,17 @@ class Grid:
         self.max_y_location = max(self.max_y_location, location.y)
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
         )
 
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
+        )
+        return self.neighbour_table
+
     def __str__(self) -> str:
         rows: list[str] = []
         for y_index in range(self.max_y_location + 1):
@@ -230,9 +202,8 @@ class Grid:
         return "\n".join(rows)
 
 
-def create_grid(data: typing.Iterator[str]) -> tuple[Grid, typing.Iterator[str]]:
+def create_grid(data: typing.Iterator[str]) -> Grid:
     grid = Grid()
-    found_blank_line = False
     for y_index, line in enumerate(data):
         for x_index, character in enumerate(line):
             location = Location(x_index, y_index)
@@ -246,22 +217,15 @@ def create_grid(data: typing.Iterator[str]) -> tuple[Grid, typing.Iterator[str]]
                     location_type = LocationType.BOX
                 case LocationType.WALL.value:
                     location_type = LocationType.WALL
-                case LocationType.SPLITTER.value:
-                    found_blank_line = True
-                    break
                 case _:
                     raise ValueError(f"Invalid character: {character}")
             grid_location = GridLocation(location, location_type)
             grid.add_grid_location(grid_location)
 
-        if found_blank_line:
-            break
+    return grid
 
-    return grid, data
-
-def create_grid_new(data: typing.Iterator[str], wide_warehouse: bool = False) -> tuple[Grid, typing.Iterator[str]]:
+def create_grid_new(data: typing.Iterator[str], wide_warehouse: bool = False) -> Grid:
     grid = Grid()
-    found_blank_line = False
     for y_index, line in enumerate(data):
         x_index = 0
         # for x_index, character in enumerate(line):
@@ -301,20 +265,13 @@ def create_grid_new(data: typing.Iterator[str], wide_warehouse: bool = False) ->
                     location = Location(x_index, y_index)
                     new_grid_locations.append(GridLocation(location, LocationType.WALL))
                     x_index += 1
-                case LocationType.SPLITTER.value:
-                    found_blank_line = True
-                    break
                 case _:
                     raise ValueError(f"Invalid character: {character}")
 
             for grid_location in new_grid_locations:
                 grid.add_grid_location(grid_location)
 
-
-        if found_blank_line:
-            break
-
-    return grid, data
+    return grid
 
 @dataclasses.dataclass
 class Movements:
@@ -350,10 +307,16 @@ class RobotMovement:
         if not robot_location:
             raise ValueError("No robot location found")
 
+        neighbour_table = self.grid.get_neighbour_table()
         current_location = robot_location
         locations_to_move: list[Location] = [current_location]
         while True:
-            current_location = current_location.neighbour_location(location_direction)
+            next_location = neighbour_table.neighbour(
+                current_location, location_direction
+            )
+            if next_location is None:
+                return
+            current_location = next_location
             grid_location = self.grid.get_grid_location(current_location)
             match grid_location.location_type:
                 case LocationType.WALL:
@@ -366,15 +329,9 @@ class RobotMovement:
         for location in locations_to_move[::-1]:
             grid_location = self.grid.get_grid_location(location)
             self.grid.remove_grid_location(grid_location)
-            match location_direction:
-                case LocationDirection.UP:
-                    new_location = Location(grid_location.x, grid_location.y - 1)
-                case LocationDirection.DOWN:
-                    new_location = Location(grid_location.x, grid_location.y + 1)
-                case LocationDirection.LEFT:
-                    new_location = Location(grid_location.x - 1, grid_location.y)
-                case LocationDirection.RIGHT:
-                    new_location = Location(grid_location.x + 1, grid_location.y)
+            new_location = neighbour_table.neighbour(location, location_direction)
+            if new_location is None:
+                raise ValueError("Cannot move off the grid")
             grid_location.location = new_location
             self.grid.add_grid_location(grid_location)
 
@@ -456,9 +413,9 @@ class RobotMovement:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid, data = create_grid(data)
-    movements = create_movements(data)
+    grid_lines, movement_lines = read_sections(FILENAME)
+    grid = create_grid(iter(grid_lines))
+    movements = create_movements(iter(movement_lines))
     # print("Initial state:")
     # print(grid)
 
@@ -473,9 +430,9 @@ def part_one() -> int:
 
 
 def part_two() -> int:
-    data = yield_data(TEST_FILENAME)
-    grid, data = create_grid_new(data, True)
-    movements = create_movements(data)
+    grid_lines, movement_lines = read_sections(TEST_FILENAME)
+    grid = create_grid_new(iter(grid_lines), True)
+    movements = create_movements(iter(movement_lines))
     print("Initial state:")
     print(grid)
 
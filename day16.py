@@ -1,20 +1,27 @@
 import dataclasses
 import enum
 import typing
-import heapq
-import collections
+
+from geometry import (
+    LOCATION_DIRECTIONS,
+    Location,
+    LocationDirection,
+    NeighbourTable,
+    fit_neighbour_table,
+    id_location,
+    location_id,
+    turn_left,
+    turn_right,
+)
+from parse_cache import load_parsed
+from progress import create_progress
+from search import dijkstra_search
 
 
 TEST_FILENAME = "day16_testdata.txt"
 FILENAME = "day16_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 Cost = int | float
 
 
@@ -27,27 +34,6 @@ class LocationType(enum.Enum):
     PATH = "^"
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-    def distance(self, other_location: "Location") -> int:
-        return abs(self.x - other_location.x) + abs(self.y - other_location.y)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 @enum.unique
 class Movements(enum.Enum):
     FORWARD = enum.auto()
@@ -55,38 +41,6 @@ class Movements(enum.Enum):
     TURN_RIGHT = enum.auto()
 
 
-def turn_right(location_direction: LocationDirection) -> LocationDirection:
-    match location_direction:
-        case LocationDirection.UP:
-            location_direction = LocationDirection.RIGHT
-        case LocationDirection.RIGHT:
-            location_direction = LocationDirection.DOWN
-        case LocationDirection.DOWN:
-            location_direction = LocationDirection.LEFT
-        case LocationDirection.LEFT:
-            location_direction = LocationDirection.UP
-        case _:
-            raise ValueError(f"Invalid type: {location_direction}")
-
-    return location_direction
-
-
-def turn_left(location_direction: LocationDirection) -> LocationDirection:
-    match location_direction:
-        case LocationDirection.UP:
-            location_direction = LocationDirection.LEFT
-        case LocationDirection.RIGHT:
-            location_direction = LocationDirection.UP
-        case LocationDirection.DOWN:
-            location_direction = LocationDirection.RIGHT
-        case LocationDirection.LEFT:
-            location_direction = LocationDirection.DOWN
-        case _:
-            raise ValueError(f"Invalid type: {location_direction}")
-
-    return location_direction
-
-
 FACING_DIRECTION_LABEL: dict[LocationDirection, str] = {
     LocationDirection.UP: "^",
     LocationDirection.RIGHT: ">",
@@ -125,6 +79,9 @@ class Grid:
     max_y_location: int = 0
     start_location: typing.Optional[Location] = None
     end_location: typing.Optional[Location] = None
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_grid_location(self, grid_location: GridLocation) -> None:
         if grid_location.location_type in (
@@ -168,14 +125,16 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
+        )
+
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
         )
+        return self.neighbour_table
 
     def __str__(self) -> str:
         rows: list[str] = []
@@ -194,7 +153,8 @@ class Grid:
             max_x_location=self.max_x_location,
             max_y_location=self.max_y_location, 
             start_location=self.start_location,
-            end_location=self.end_location)
+            end_location=self.end_location,
+            neighbour_table=self.neighbour_table)
 
 
 def create_grid(data: typing.Iterator[str]) -> Grid:
@@ -222,226 +182,115 @@ def create_grid(data: typing.Iterator[str]) -> Grid:
     return grid
 
 
+FORWARD_COST: typing.Final[int] = 1
+TURN_COST: typing.Final[int] = 1000
+FACING_DIRECTION_INDEX: dict[LocationDirection, int] = {
+    location_direction: index
+    for index, location_direction in enumerate(LOCATION_DIRECTIONS)
+}
 
 
 @dataclasses.dataclass
-class Path:
+class Maze:
     grid: Grid
-    cost: Cost = 0
-    path_grid_locations: list[GridLocation] = dataclasses.field(default_factory=list)
+    end_location: Location
+    neighbour_table: NeighbourTable = dataclasses.field(init=False, repr=False)
 
-    @property
-    def current_path_grid_location(self) -> GridLocation:
-        return self.path_grid_locations[-1]
+    def __post_init__(self) -> None:
+        self.neighbour_table = self.grid.get_neighbour_table()
 
     @property
-    def current_path_location(self) -> Location:
-        return self.current_path_grid_location.location
+    def width(self) -> int:
+        return self.grid.max_x_location + 1
 
     @property
-    def facing_direction(self) -> typing.Optional[LocationDirection]:
-        return self.current_path_grid_location.facing_direction
+    def state_count(self) -> int:
+        return self.width * (self.grid.max_y_location + 1) * len(LOCATION_DIRECTIONS)
 
-    def add_grid_location(self, grid_location: GridLocation) -> None:
-        self.path_grid_locations.append(grid_location)
-        return None
-    
-    @property
-    def can_move_forward(self) -> bool:
-        facing_direction = self.facing_direction
-        if not facing_direction:
-            raise ValueError("No facing direction found")
-        neighbour_location = self.current_path_location.neighbour_location(
-            facing_direction
+    def state(self, location: Location, facing_direction: LocationDirection) -> int:
+        return (
+            location_id(location, self.width) * len(LOCATION_DIRECTIONS)
+            + FACING_DIRECTION_INDEX[facing_direction]
         )
-        neighbour_grid_location = self.grid.get_grid_location(neighbour_location)
 
-        return neighbour_grid_location.location_type not in (LocationType.OBSTRUCTION, LocationType.OUT_OF_BOUNDS)
+    def state_location(self, state: int) -> Location:
+        return id_location(state // len(LOCATION_DIRECTIONS), self.width)
 
-    def forward_path_grid_location(self) -> tuple[GridLocation, Cost]:
-        facing_direction = self.facing_direction
-        if not facing_direction:
-            raise ValueError("No facing direction found")
-        neighbour_location = self.current_path_location.neighbour_location(
-            facing_direction
-        )
-        neighbour_grid_location = self.grid.get_grid_location(neighbour_location)
-        path_grid_location = dataclasses.replace(
-            neighbour_grid_location,
-            location_type=LocationType.PATH,
-            facing_direction=facing_direction,
-        )
-        return path_grid_location, 1
+    def state_facing_direction(self, state: int) -> LocationDirection:
+        return LOCATION_DIRECTIONS[state % len(LOCATION_DIRECTIONS)]
 
-    def turn_left_path_grid_location(self) -> tuple[GridLocation, Cost]:
-        facing_direction = self.facing_direction
-        if not facing_direction:
-            raise ValueError("No facing direction found")
-
-        facing_direction = turn_left(facing_direction)
-        path_grid_location = dataclasses.replace(
-            self.current_path_grid_location,
-            facing_direction=facing_direction,
+    def can_move_to(self, location: Location) -> bool:
+        grid_location = self.grid.get_grid_location(location)
+        return grid_location.location_type not in (
+            LocationType.OBSTRUCTION,
+            LocationType.OUT_OF_BOUNDS,
         )
-        return path_grid_location, 1000
-
-    def turn_right_path_grid_location(self) -> tuple[GridLocation, Cost]:
-        facing_direction = self.facing_direction
-        if not facing_direction:
-            raise ValueError("No facing direction found")
-
-        facing_direction = turn_right(facing_direction)
-        path_grid_location = dataclasses.replace(
-            self.current_path_grid_location,
-            facing_direction=facing_direction,
-        )
-        return path_grid_location, 1000
-    
-    def __str__(self) -> str:
-        new_grid = self.grid.copy()
-        added_locations: set[Location] = set()
-        for path_grid_location in self.path_grid_locations:
-            if path_grid_location.location in added_locations:
-                continue
-            new_grid.add_grid_location(path_grid_location)  
-            added_locations.add(path_grid_location.location)
-        return str(new_grid)
-    
-    def copy(self) -> "Path":
-        return Path(cost=self.cost, grid=self.grid, path_grid_locations=self.path_grid_locations.copy())
 
+    def movements(self, state: int) -> typing.Iterator[tuple[int, int]]:
+        location = self.state_location(state)
+        facing_direction = self.state_facing_direction(state)
+        for movement in Movements:
+            match movement:
+                case Movements.FORWARD:
+                    direction = facing_direction
+                    cost = FORWARD_COST
+                case Movements.TURN_LEFT:
+                    direction = turn_left(facing_direction)
+                    cost = TURN_COST + FORWARD_COST
+                case Movements.TURN_RIGHT:
+                    direction = turn_right(facing_direction)
+                    cost = TURN_COST + FORWARD_COST
+            neighbour_location = self.neighbour_table.neighbour(location, direction)
+            if neighbour_location is not None and self.can_move_to(neighbour_location):
+                yield self.state(neighbour_location, direction), cost
 
-@dataclasses.dataclass(order=True)
-class PrioritizedItem:
-    priority: int | float
-    path: Path = dataclasses.field(compare=False)
+    def is_end(self, state: int) -> bool:
+        return self.state_location(state) == self.end_location
 
+    def distance_to_end(self, state: int) -> int:
+        return self.state_location(state).distance(self.end_location)
 
 
-def shortest_cheapest_path(grid: Grid, stop_at_first: bool = True) -> tuple[Cost,list[Path]]:
+def shortest_cheapest_path(
+    grid: Grid, stop_at_first: bool = True
+) -> tuple[Cost, set[Location]]:
     start_location = grid.start_location
     end_location = grid.end_location
     if not start_location or not end_location:
         raise ValueError("Start or end location not found")
-    grid_location = grid.get_grid_location(start_location)
-    path_grid_location = dataclasses.replace(
-        grid_location,
-        location_type=LocationType.PATH,
-        facing_direction=LocationDirection.RIGHT,
-    )
-    path = Path(grid)
-    path.add_grid_location(path_grid_location)
-    queue: list[PrioritizedItem] = [PrioritizedItem(float("inf"), path)]
-    visited_grid_locations: set[GridLocation] = set()
-    cheapest_grid_location: collections.defaultdict[GridLocation, int | float] = collections.defaultdict(lambda: float("inf"))
-    cheapest_path: int | float = float("inf")
-    cheapest_paths: list[Path] = []
-    while queue:
-        prioritized_item = heapq.heappop(queue)
-        path = prioritized_item.path
-        print(f"Queue size: {len(queue)=} Distance: {path.current_path_location.distance(end_location)}")
-        # print(path)
-        # print(f"{path.current_path_location=} {path.facing_direction=} {path.cost=}")
-        if path.current_path_location == end_location:
-            if stop_at_first:
-                return path.cost, [path]
-            else:
-                if path.cost > cheapest_path:
-                    break
-
-            
-            # if not cheapest_paths:
-            #     cheapest_paths.append(path)
-            # elif path.cost == cheapest_paths[0].cost:
-            #     cheapest_paths.append(path)
-            cheapest_paths.append(path)
-            cheapest_path = min(cheapest_path, path.cost)
-            continue
-
-
-        if stop_at_first:
-            if path.current_path_grid_location in visited_grid_locations:
-                continue
-        else:
-            if path.cost > cheapest_grid_location[path.current_path_grid_location]:
-                continue
-            cheapest_grid_location[path.current_path_grid_location] = path.cost
-        visited_grid_locations.add(path.current_path_grid_location)
-
-
-        for movement in Movements:
-            match movement:
-                case Movements.FORWARD:
-                    if not path.can_move_forward:
-                        continue
-                    path_grid_location, cost = path.forward_path_grid_location()
-                    new_path = path.copy()
-                    new_path.add_grid_location(path_grid_location)
-                    new_path.cost += cost
-                    distance = new_path.current_path_location.distance(end_location)
-                    priority = new_path.cost + distance
-                    heapq.heappush(queue, PrioritizedItem(priority, new_path))
-                case Movements.TURN_LEFT:
-                    path_grid_location, cost = path.turn_left_path_grid_location()
-                    new_path = path.copy()
-                    new_path.add_grid_location(path_grid_location)
-                    new_path.cost += cost
-
-                    if not new_path.can_move_forward:
-                        continue
-                    path_grid_location, cost = new_path.forward_path_grid_location()
-                    new_path.add_grid_location(path_grid_location)
-                    new_path.cost += cost
-                    
-                    distance = new_path.current_path_location.distance(end_location)
-                    priority = new_path.cost + distance
-                    heapq.heappush(queue, PrioritizedItem(priority, new_path))
-                case Movements.TURN_RIGHT:
-                    path_grid_location, cost = path.turn_right_path_grid_location()
-                    new_path = path.copy()
-                    new_path.add_grid_location(path_grid_location)
-                    new_path.cost += cost
-
-                    if not new_path.can_move_forward:
-                        continue
-                    path_grid_location, cost = new_path.forward_path_grid_location()
-                    new_path.add_grid_location(path_grid_location)
-                    new_path.cost += cost
-
-                    distance = new_path.current_path_location.distance(end_location)
-                    priority = new_path.cost + distance
-                    heapq.heappush(queue, PrioritizedItem(priority, new_path))
-    if not cheapest_paths:
-        return -1, []
-    return cheapest_path, [path for path in cheapest_paths if path.cost == cheapest_path]
-
-def unique_path_locations(paths: list[Path]) -> set[Location]:
-    unique_locations: set[Location] = set()
-    for path in paths:
-        for grid_locaion in path.path_grid_locations:
-            unique_locations.add(grid_locaion.location)
-    return unique_locations 
+    maze = Maze(grid, end_location)
+    with create_progress("shortest cheapest path") as progress:
+        result = dijkstra_search(
+            maze.state_count,
+            maze.state(start_location, LocationDirection.RIGHT),
+            maze.movements,
+            maze.is_end,
+            maze.distance_to_end,
+            all_predecessors=not stop_at_first,
+            progress=progress,
+        )
+    if result.goal is None:
+        return -1, set()
+    path_locations = {
+        maze.state_location(state) for state in result.path_nodes(result.goals)
+    }
+    return result.distance(result.goal), path_locations
 
 
 def part_one() -> int | float:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     print(grid)
-    cost, paths = shortest_cheapest_path(grid)
+    cost, _ = shortest_cheapest_path(grid)
 
     return cost
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     print(grid)
-    cost, paths = shortest_cheapest_path(grid, False)
-    print(f"{len(paths)=}")
+    cost, unique_locations = shortest_cheapest_path(grid, False)
     print(f"{cost=}")
 
-    unique_locations = unique_path_locations(paths)
-
     return len(unique_locations)
 
 
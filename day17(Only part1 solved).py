@@ -2,17 +2,14 @@ import typing
 import dataclasses
 import operator
 
+from parse_cache import load_parsed
+from progress import create_progress
+
 
 TEST_FILENAME = "day17_testdata.txt"
 FILENAME = "day17_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 @dataclasses.dataclass
 class Computer:
     register_a: int
@@ -100,8 +97,7 @@ def create_computer(data: typing.Iterator[str]) -> Computer:
 
 
 def part_one() -> str:
-    data = yield_data(FILENAME)
-    computer = create_computer(data)
+    computer = load_parsed(FILENAME, create_computer)
     print(computer)
     while computer.has_instruction:
         computer.run_instruction()
@@ -110,27 +106,27 @@ def part_one() -> str:
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    orginal_computer = create_computer(data)
+    orginal_computer = load_parsed(FILENAME, create_computer)
 
     # print(computer)
     register_a = 0
-    while True:
-        computer = Computer(
-            register_a,
-            orginal_computer.register_b,
-            orginal_computer.register_c,
-            orginal_computer.program,
-        )
-
-        print(f"In loop: {register_a}")
-        while computer.has_instruction:
-            computer.run_instruction()
-        if computer.out == computer.program:
-            print(f"Found match")
-            break
-
-        register_a += 1
+    with create_progress("register a") as progress:
+        while True:
+            computer = Computer(
+                register_a,
+                orginal_computer.register_b,
+                orginal_computer.register_c,
+                orginal_computer.program,
+            )
+
+            progress.advance()
+            while computer.has_instruction:
+                computer.run_instruction()
+            if computer.out == computer.program:
+                print(f"Found match")
+                break
+
+            register_a += 1
 
     return register_a
 
@@ -3,17 +3,21 @@ import dataclasses
 import enum
 import typing
 
+from geometry import (
+    Location,
+    NeighbourTable,
+    fit_neighbour_table,
+    id_location,
+    location_id,
+)
+from parse_cache import load_parsed
+from search import breadth_first_search
+
 
 TEST_FILENAME = "day18_testdata.txt"
 FILENAME = "day18_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 @dataclasses.dataclass
 class Defaults:
     filename: str
@@ -38,24 +42,6 @@ class LocationType(enum.Enum):
     OUT_OF_BOUNDS = "X"
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 @dataclasses.dataclass(slots=True)
 class GridLocation:
     location: Location
@@ -83,6 +69,9 @@ class Grid:
     max_y_location: int = 0
     corrupted_bytes: list[Location] = dataclasses.field(default_factory=list)
     byte_index: int = 0
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_corrupted_byte(self, location: Location) -> None:
         self.corrupted_bytes.append(location)
@@ -122,14 +111,16 @@ class Grid:
         return None
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
+        )
+
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
         )
+        return self.neighbour_table
 
     def __str__(self) -> str:
         rows: list[str] = []
@@ -165,21 +156,6 @@ class Path:
     history: deque[Location] = dataclasses.field(default_factory=deque)
     steps: int = 0
 
-    def is_valid_location(self, location: Location) -> bool:
-        grid_location = self.grid.get_grid_location(location)
-        return grid_location.location_type == LocationType.EMPTY
-
-    def get_neighbours(self) -> typing.Iterator[Location]:
-        for direction in LocationDirection:
-            neighbour_location = self.current_location.neighbour_location(direction)
-            if self.is_valid_location(neighbour_location):
-                yield neighbour_location
-
-    def move(self, location: Location) -> None:
-        self.current_location = location
-        self.history.append(location)
-        self.steps += 1
-
     def is_at_destination(self) -> bool:
         return self.current_location == self.end_location
 
@@ -189,41 +165,55 @@ class PathFinder:
     start_location: Location
     end_location: Location
     grid: Grid
-    queue: deque[Path] = dataclasses.field(default_factory=deque)
-    visited: set[Location] = dataclasses.field(default_factory=set)
+    neighbour_table: NeighbourTable = dataclasses.field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.neighbour_table = self.grid.get_neighbour_table()
+
+    @property
+    def width(self) -> int:
+        return self.grid.max_x_location + 1
+
+    @property
+    def node_count(self) -> int:
+        return self.width * (self.grid.max_y_location + 1)
+
+    def is_valid_location(self, location: Location) -> bool:
+        grid_location = self.grid.get_grid_location(location)
+        return grid_location.location_type == LocationType.EMPTY
 
-    def __post_init__(self):
-        path = Path(self.start_location, self.end_location, self.grid)
-        self.queue.append(path)
+    def neighbours(self, node: int) -> typing.Iterator[int]:
+        location = id_location(node, self.width)
+        for neighbour_location in self.neighbour_table.all_neighbours(location):
+            if neighbour_location is not None and self.is_valid_location(
+                neighbour_location
+            ):
+                yield location_id(neighbour_location, self.width)
 
     def find_shortest_path(self) -> typing.Optional[Path]:
-        while self.queue:
-            path = self.queue.popleft()
-            if path.current_location in self.visited:
-                continue
-            self.visited.add(path.current_location)
-
-            if path.is_at_destination():
-                return path
-
-            for neighbour in path.get_neighbours():
-                new_path = Path(
-                    neighbour,
-                    self.end_location,
-                    self.grid,
-                    path.history.copy(),
-                    path.steps,
-                )
-                new_path.move(neighbour)
-                self.queue.append(new_path)
+        end_node = location_id(self.end_location, self.width)
+        result = breadth_first_search(
+            self.node_count,
+            location_id(self.start_location, self.width),
+            self.neighbours,
+            lambda node: node == end_node,
+        )
+        if result.goal is None:
+            return None
 
-        return None
+        history = deque(
+            id_location(node, self.width) for node in result.path(end_node)[1:]
+        )
+        return Path(
+            self.end_location, self.end_location, self.grid, history, len(history)
+        )
 
 
 def part_one() -> int:
     defaults = FILE_DEFAULTS
-    data = yield_data(defaults.filename)
-    grid = create_grid(data, defaults.max_x_location, defaults.max_y_location)
+    grid = load_parsed(
+        defaults.filename, create_grid, defaults.max_x_location, defaults.max_y_location
+    )
     for _ in range(defaults.falling_byte_qty):
         grid.add_corrupted_byte_to_grid()
     print(grid)
@@ -242,8 +232,9 @@ def part_one() -> int:
 
 def part_two() -> tuple[int, int]:
     defaults = FILE_DEFAULTS
-    data = yield_data(defaults.filename)
-    grid = create_grid(data, defaults.max_x_location, defaults.max_y_location)
+    grid = load_parsed(
+        defaults.filename, create_grid, defaults.max_x_location, defaults.max_y_location
+    )
     for _ in range(defaults.falling_byte_qty):
         grid.add_corrupted_byte_to_grid()
 
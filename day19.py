@@ -1,17 +1,14 @@
 import dataclasses
 import typing
 
+from parse_cache import load_parsed
+from progress import create_progress
+
 
 TEST_FILENAME = "day19_testdata.txt"
 FILENAME = "day19_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 @dataclasses.dataclass
 class Onsen:
     patterns: set[str] = dataclasses.field(default_factory=set)
@@ -34,13 +31,14 @@ class Onsen:
 
     def possible_patterns(self, count_all_ways: bool = False) -> int:
         pattern_qty = 0
-        for design in self.designs:
-            print(f"{design=}")
-            patterns_qty = self.patterns_in_design(design)
-            if not count_all_ways and patterns_qty > 0:
-                pattern_qty += 1
-            else:
-                pattern_qty += patterns_qty
+        with create_progress("designs", len(self.designs)) as progress:
+            for design in self.designs:
+                progress.advance()
+                patterns_qty = self.patterns_in_design(design)
+                if not count_all_ways and patterns_qty > 0:
+                    pattern_qty += 1
+                else:
+                    pattern_qty += patterns_qty
 
         return pattern_qty
 
@@ -56,15 +54,13 @@ def create_onsen(data: typing.Iterator[str]) -> Onsen:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    onsen = create_onsen(data)
+    onsen = load_parsed(FILENAME, create_onsen)
     possible_patterns = onsen.possible_patterns()
     return possible_patterns
 
 
 def part_two() -> int:
-    data = yield_data(FILENAME)
-    onsen = create_onsen(data)
+    onsen = load_parsed(FILENAME, create_onsen)
     possible_patterns = onsen.possible_patterns(True)
     return possible_patterns
 
@@ -3,17 +3,23 @@ import enum
 import typing
 import collections
 
+from loader import yield_data
+from geometry import (
+    Location,
+    LocationDirection,
+    NeighbourTable,
+    fit_neighbour_table,
+    id_location,
+    location_id,
+)
+from parse_cache import load_parsed
+from search import breadth_first_search
+
 
 TEST_FILENAME = "day20_testdata.txt"
 FILENAME = "day20_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 class LocationType(enum.Enum):
     OBSTRUCTION = "#"
     EMPTY = "."
@@ -23,27 +29,6 @@ class LocationType(enum.Enum):
     PATH = "^"
 
 
-@dataclasses.dataclass(slots=True, frozen=True)
-class Location:
-    x: int
-    y: int
-
-    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
-        other_location: "Location" = location_direction.value
-        return Location(self.x + other_location.x, self.y + other_location.y)
-
-    def __mul__(self, other: int) -> "Location":
-        return Location(self.x * other, self.y * other)
-
-
-@enum.unique
-class LocationDirection(enum.Enum):
-    UP = Location(0, -1)
-    RIGHT = Location(1, 0)
-    DOWN = Location(0, 1)
-    LEFT = Location(-1, 0)
-
-
 PATH_DIRECTION_LABEL: dict[LocationDirection, str] = {
     LocationDirection.UP: "^",
     LocationDirection.RIGHT: ">",
@@ -82,6 +67,9 @@ class Grid:
     max_y_location: int = 0
     start_location: typing.Optional[Location] = None
     end_location: typing.Optional[Location] = None
+    neighbour_table: typing.Optional[NeighbourTable] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
 
     def add_grid_location(self, grid_location: GridLocation) -> None:
         location_type = grid_location.location_type
@@ -127,15 +115,17 @@ class Grid:
         return grid_location
 
     def location_in_grid(self, location: Location) -> bool:
-        return all(
-            (
-                location.x > -1,
-                location.x < self.max_x_location + 1,
-                location.y > -1,
-                location.y < self.max_y_location + 1,
-            )
+        return (
+            0 <= location.x <= self.max_x_location
+            and 0 <= location.y <= self.max_y_location
         )
 
+    def get_neighbour_table(self) -> NeighbourTable:
+        self.neighbour_table = fit_neighbour_table(
+            self.neighbour_table, self.max_x_location + 1, self.max_y_location + 1
+        )
+        return self.neighbour_table
+
     def __str__(self) -> str:
         rows: list[str] = []
         for y_index in range(self.max_y_location + 1):
@@ -192,46 +182,45 @@ class Path:
         return str(grid)
 
 
+def track_neighbours(grid: Grid, node: int) -> typing.Iterator[int]:
+    width = grid.max_x_location + 1
+    location = id_location(node, width)
+    for neighbour_location in grid.get_neighbour_table().all_neighbours(location):
+        if neighbour_location is None:
+            continue
+        neighbour_grid_location = grid.get_grid_location(neighbour_location)
+        if neighbour_grid_location.location_type == LocationType.OBSTRUCTION:
+            continue
+        yield location_id(neighbour_location, width)
+
+
 def find_path(grid: Grid) -> Path:
     if not grid.start_location:
         raise ValueError("No start location found")
     if not grid.end_location:
         raise ValueError("No end location found")
-    current_grid_location = grid.get_grid_location(grid.start_location)
-    end_grid_location = grid.get_grid_location(grid.end_location)
-    grid_location_history = [current_grid_location]
-    seen_locations = {current_grid_location.location}
+    width = grid.max_x_location + 1
+    end_node = location_id(grid.end_location, width)
+    result = breadth_first_search(
+        width * (grid.max_y_location + 1),
+        location_id(grid.start_location, width),
+        lambda node: track_neighbours(grid, node),
+        lambda node: node == end_node,
+    )
+    previous_location = grid.start_location
+    grid_location_history = [grid.get_grid_location(previous_location)]
+    for node in result.path(end_node)[1:]:
+        location = id_location(node, width)
+        path_grid_location = dataclasses.replace(
+            grid.get_grid_location(location),
+            location_type=LocationType.PATH,
+            facing_direction=LocationDirection(location.differance(previous_location)),
+        )
+        grid_location_history.append(path_grid_location)
+        previous_location = location
+    seen_locations = {grid_location.location for grid_location in grid_location_history}
     path = Path(grid, grid_location_history, seen_locations)
-    while True:
-        # for _ in range(85):
-        if current_grid_location == end_grid_location:
-            print(f"Found end location in {path.time - 1} steps")
-            break
-        current_grid_location = path.grid_location_history[-1]
-        location = current_grid_location.location
-        for location_direction in LocationDirection:
-            neighbour_location = location.neighbour_location(location_direction)
-            neighbour_grid_location = grid.get_grid_location(neighbour_location)
-            if neighbour_grid_location.location_type in (
-                LocationType.OUT_OF_BOUNDS,
-                LocationType.OBSTRUCTION,
-            ):
-                continue
-            if neighbour_location in path.seen_locations:
-                continue
-            path_grid_location = dataclasses.replace(
-                neighbour_grid_location,
-                location_type=LocationType.PATH,
-                facing_direction=location_direction,
-            )
-
-            path.grid_location_history.append(path_grid_location)
-            path.seen_locations.add(neighbour_grid_location.location)
-            current_grid_location = neighbour_grid_location
-            break
-
-    # path.seen_locations.remove(path.grid_location_history[0].location)
-    # path.grid_location_history.pop(0)
+    print(f"Found end location in {path.time - 1} steps")
     return path
 
 
@@ -279,6 +268,7 @@ class CheatPaths:
         return self.path.grid
 
     def find_cheat_paths(self) -> None:
+        neighbour_table = self.grid.get_neighbour_table()
         for index, grid_location in enumerate(self.path.grid_location_history[:-1]):
             location = grid_location.location
             location_direction = grid_location.facing_direction
@@ -286,22 +276,23 @@ class CheatPaths:
                 grid_location.location
                 for grid_location in self.path.grid_location_history[index + 3 :]
             )
-            for location_direction in LocationDirection:
-                neighbour_location1 = location.neighbour_location(location_direction)
-                neighbour_grid_location1 = self.grid.get_grid_location(
-                    neighbour_location1
+            for (
+                location_direction,
+                neighbour_location1,
+            ) in neighbour_table.directed_neighbours(location):
+                if neighbour_location1 is None:
+                    continue
+                neighbour_location2 = neighbour_table.neighbour(
+                    neighbour_location1, location_direction
                 )
-                neighbour_location2 = neighbour_location1.neighbour_location(
-                    location_direction
-                )
-                neighbour_grid_location2 = self.grid.get_grid_location(
-                    neighbour_location2
-                )
-                if neighbour_grid_location2.location in remaining_path_locations:
+                if neighbour_location2 in remaining_path_locations:
+                    neighbour_grid_location1 = self.grid.get_grid_location(
+                        neighbour_location1
+                    )
                     for remainder_index, grid_location in enumerate(
                         self.path.grid_location_history[index:], index
                     ):
-                        if grid_location.location == neighbour_grid_location2.location:
+                        if grid_location.location == neighbour_location2:
                             break
 
                     grid_location = dataclasses.replace(
@@ -321,8 +312,7 @@ class CheatPaths:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    grid = create_grid(data)
+    grid = load_parsed(FILENAME, create_grid)
     path = find_path(grid)
     print(f"{path.time=}")
 
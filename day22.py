@@ -1,15 +1,10 @@
-import typing
 import functools
 
-
-TEST_FILENAME = "day22_testdata.txt)
-FILENAME = "day22_data.txt"
+from loader import yield_data
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+TEST_FILENAME = "day22_testdata.txt"
+FILENAME = "day22_data.txt"
 
 
 @functools.cache
@@ -1,15 +1,10 @@
-import cProfile
 import typing
 import dataclasses
 
-
-FILENAME = "day23_data.txt"
+from parse_cache import load_parsed
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
+FILENAME = "day23_data.txt"
 
 
 @dataclasses.dataclass
@@ -65,8 +60,7 @@ def create_network(data: typing.Iterator[str]) -> Network:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    network = create_network(data)
+    network = load_parsed(FILENAME, create_network)
     network.create_first_inter_connections()
     network.add_level_of_inter_connections()
     current_index = network._index
@@ -76,8 +70,7 @@ def part_one() -> int:
 
 
 def part_two() -> str:
-    data = yield_data(FILENAME)
-    network = create_network(data)
+    network = load_parsed(FILENAME, create_network)
     network.create_first_inter_connections()
     network.add_all_levels_of_inter_connections()
     current_index = network._index - 1
@@ -3,17 +3,14 @@ import dataclasses
 import enum
 import collections
 
+from loader import yield_data
+from parse_cache import load_parsed
+
 
 TEST_FILENAME = "day24_testdata.txt"
 FILENAME = "day24_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 Value = str | None
 
 
@@ -191,8 +188,7 @@ def create_circuit(data: typing.Iterator[str]) -> Circuit:
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    circuit = create_circuit(data)
+    circuit = load_parsed(FILENAME, create_circuit)
     circuit.trigger_initial_wire_values()
 
     return circuit.binary_number()
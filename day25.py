@@ -1,17 +1,14 @@
 import typing
 import dataclasses
 
+from loader import yield_data
+from parse_cache import load_parsed
+
 
 TEST_FILENAME = "day25_testdata.txt"
 FILENAME = "day25_data.txt"
 
 
-def yield_data(filename: str) -> typing.Iterator[str]:
-    with open(file=filename, mode="r") as read_file:
-        for line in read_file:
-            yield line.strip()
-
-
 @dataclasses.dataclass
 class Lock:
     pin_heights: list[int] = dataclasses.field(default_factory=list)
@@ -57,8 +54,7 @@ def create_locks_and_keys(data: typing.Iterator[str]) -> tuple[list[Lock], list[
 
 
 def part_one() -> int:
-    data = yield_data(FILENAME)
-    locks, keys = create_locks_and_keys(data)
+    locks, keys = load_parsed(FILENAME, create_locks_and_keys)
     qty_fit: int = 0
     for key in keys:
         for lock in locks:
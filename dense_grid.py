@@ -0,0 +1,174 @@
+import array
+import dataclasses
+import typing
+
+
+OUT_OF_BOUNDS: typing.Final[int] = ord("@")
+PADDING: typing.Final[int] = 1
+NO_NEIGHBOUR: typing.Final[int] = -1
+ORTHOGONAL_OFFSETS: typing.Final[tuple[tuple[int, int], ...]] = (
+    (0, -1),
+    (1, 0),
+    (0, 1),
+    (-1, 0),
+)
+
+
+@dataclasses.dataclass(slots=True)
+class DenseGrid:
+    width: int
+    height: int
+    cells: bytearray
+    padding: int = PADDING
+    out_of_bounds: int = OUT_OF_BOUNDS
+    _neighbour_table: typing.Optional[list[array.array]] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def stride(self) -> int:
+        return self.width + 2 * self.padding
+
+    @property
+    def max_x_location(self) -> int:
+        return self.width - 1
+
+    @property
+    def max_y_location(self) -> int:
+        return self.height - 1
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def location(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def offset(self, x: int, y: int) -> int:
+        return y * self.stride + x
+
+    # The padded border keeps index + offset inside cells for every cell in
+    # the grid, so searches that stop at the border value need no table.
+    @property
+    def neighbour_offsets(self) -> tuple[int, ...]:
+        return tuple(self.offset(x, y) for x, y in ORTHOGONAL_OFFSETS)
+
+    # A grid without padding has no border to stop on, so it needs the table;
+    # it costs four int arrays the size of cells, so it is only built when a
+    # caller asks for it.
+    @property
+    def neighbour_table(self) -> list[array.array]:
+        if self._neighbour_table is None:
+            self._neighbour_table = self.create_neighbour_table(ORTHOGONAL_OFFSETS)
+        return self._neighbour_table
+
+    def location_in_grid(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def in_grid(self, index: int) -> bool:
+        return self.cells[index] != self.out_of_bounds
+
+    def value(self, x: int, y: int) -> int:
+        if not self.location_in_grid(x, y):
+            return self.out_of_bounds
+        return self.cells[self.index(x, y)]
+
+    def label(self, x: int, y: int) -> str:
+        return chr(self.value(x, y))
+
+    def set_value(self, x: int, y: int, value: int) -> None:
+        if not self.location_in_grid(x, y):
+            raise IndexError(f"Location out of bounds: {(x, y)}")
+        self.cells[self.index(x, y)] = value
+        return None
+
+    def row(self, y: int) -> memoryview:
+        start = self.index(0, y)
+        return memoryview(self.cells)[start : start + self.width]
+
+    def indexes(self) -> typing.Iterator[int]:
+        for y_index in range(self.height):
+            start = self.index(0, y_index)
+            yield from range(start, start + self.width)
+
+    def find(self, value: int) -> int:
+        index = self.cells.find(value)
+        if index == -1:
+            raise ValueError(f"Value not found: {chr(value)}")
+        return index
+
+    def find_all(self, value: int) -> list[int]:
+        indexes: list[int] = []
+        index = self.cells.find(value)
+        while index != -1:
+            indexes.append(index)
+            index = self.cells.find(value, index + 1)
+        return indexes
+
+    def create_neighbour_table(
+        self, offsets: typing.Sequence[tuple[int, int]]
+    ) -> list[array.array]:
+        neighbour_table: list[array.array] = []
+        for x_offset, y_offset in offsets:
+            neighbours = self.layer("i", NO_NEIGHBOUR)
+            index_offset = self.offset(x_offset, y_offset)
+            x_start = max(0, -x_offset)
+            x_end = min(self.width, self.width - x_offset)
+            for y_index in range(
+                max(0, -y_offset), min(self.height, self.height - y_offset)
+            ):
+                start = self.index(x_start, y_index)
+                end = self.index(x_end, y_index)
+                if start < end:
+                    neighbours[start:end] = array.array(
+                        "i", range(start + index_offset, end + index_offset)
+                    )
+            neighbour_table.append(neighbours)
+        return neighbour_table
+
+    def layer(self, typecode: str, fill: int | float = 0) -> array.array:
+        return array.array(typecode, [fill]) * len(self.cells)
+
+    def copy(self) -> "DenseGrid":
+        dense_grid = DenseGrid(
+            self.width, self.height, self.cells[:], self.padding, self.out_of_bounds
+        )
+        dense_grid._neighbour_table = self._neighbour_table
+        return dense_grid
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.row(y_index).tobytes().decode() for y_index in range(self.height)
+        )
+
+
+def create_dense_grid(
+    data: typing.Iterable[str | bytes],
+    padding: int = PADDING,
+    out_of_bounds: int = OUT_OF_BOUNDS,
+) -> DenseGrid:
+    rows: list[bytes] = []
+    for line in data:
+        row = line.encode() if isinstance(line, str) else bytes(line)
+        if not row:
+            break
+        if rows and len(row) != len(rows[0]):
+            raise ValueError(
+                f"Row {len(rows)} has length {len(row)}, not {len(rows[0])}"
+            )
+        if out_of_bounds in row:
+            raise ValueError(f"Row {len(rows)} contains the border value")
+        rows.append(row)
+
+    width = len(rows[0]) if rows else 0
+    height = len(rows)
+    stride = width + 2 * padding
+    border = bytes((out_of_bounds,)) * padding
+    cells = bytearray(bytes((out_of_bounds,)) * stride * padding)
+    for row in rows:
+        cells += border
+        cells += row
+        cells += border
+    cells += bytes((out_of_bounds,)) * stride * padding
+
+    return DenseGrid(width, height, cells, padding, out_of_bounds)
@@ -0,0 +1,446 @@
+import argparse
+import itertools
+import math
+import pathlib
+import random
+import string
+import sys
+import typing
+
+
+DEFAULT_SEED = 2024
+LOWERCASE_LETTERS = string.ascii_lowercase
+TOWEL_COLOURS = "wubrg"
+FREQUENCIES = string.digits + string.ascii_letters
+MOVES = "<>^v"
+DAY18_SIZE = 71
+DAY18_FALLING_BYTES = 1024
+
+Generator = typing.Callable[[float, random.Random], str]
+
+
+def scaled_count(count: int, scale: float) -> int:
+    return max(1, round(count * scale))
+
+
+def scaled_side(side: int, scale: float, minimum: int = 5) -> int:
+    return max(minimum, round(side * math.sqrt(scale)))
+
+
+def odd(value: int) -> int:
+    return value if value % 2 else value + 1
+
+
+def join_lines(lines: typing.Iterable[str]) -> str:
+    return "\n".join(lines) + "\n"
+
+
+def join_rows(rows: list[list[str]]) -> str:
+    return join_lines("".join(row) for row in rows)
+
+
+def walled_rows(side: int) -> list[list[str]]:
+    rows = [["."] * side for _ in range(side)]
+    for index in range(side):
+        rows[0][index] = rows[side - 1][index] = "#"
+        rows[index][0] = rows[index][side - 1] = "#"
+    return rows
+
+
+def carve_maze(side: int, rng: random.Random) -> list[list[str]]:
+    rows = [["#"] * side for _ in range(side)]
+    start = (1, side - 2)
+    rows[start[1]][start[0]] = "."
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        neighbours = [
+            (x + dx, y + dy, dx, dy)
+            for dx, dy in ((0, -2), (2, 0), (0, 2), (-2, 0))
+            if 0 < x + dx < side - 1
+            and 0 < y + dy < side - 1
+            and rows[y + dy][x + dx] == "#"
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        next_x, next_y, dx, dy = rng.choice(neighbours)
+        rows[y + dy // 2][x + dx // 2] = "."
+        rows[next_y][next_x] = "."
+        stack.append((next_x, next_y))
+    return rows
+
+
+def maze_path(
+    rows: list[list[str]], start: tuple[int, int], end: tuple[int, int]
+) -> list[tuple[int, int]]:
+    previous: dict[tuple[int, int], tuple[int, int]] = {start: start}
+    queue = [start]
+    for x, y in queue:
+        if (x, y) == end:
+            break
+        for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+            neighbour = (x + dx, y + dy)
+            if rows[neighbour[1]][neighbour[0]] == "." and neighbour not in previous:
+                previous[neighbour] = (x, y)
+                queue.append(neighbour)
+
+    path = [end]
+    while path[-1] != start:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return path
+
+
+def generate_day01(scale: float, rng: random.Random) -> str:
+    return join_lines(
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+        for _ in range(scaled_count(1000, scale))
+    )
+
+
+def generate_day02(scale: float, rng: random.Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled_count(1000, scale)):
+        direction = rng.choice((-1, 1))
+        level = rng.randint(20, 80)
+        levels = [level]
+        for _ in range(rng.randint(4, 7)):
+            level += direction * rng.randint(1, 3)
+            levels.append(level)
+        if rng.random() < 0.5:
+            levels[rng.randrange(len(levels))] += rng.randint(-4, 4)
+        lines.append(" ".join(str(level) for level in levels))
+    return join_lines(lines)
+
+
+def generate_day03(scale: float, rng: random.Random) -> str:
+    noise = "mul()don't,[]{}<>?!@#$%^&*+-_ 'whowhatselectfromwhere0123456789"
+    lines: list[str] = []
+    for _ in range(scaled_count(6, scale)):
+        parts: list[str] = []
+        length = 0
+        while length < 3000:
+            roll = rng.random()
+            if roll < 0.15:
+                part = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            elif roll < 0.17:
+                part = "do()"
+            elif roll < 0.19:
+                part = "don't()"
+            else:
+                part = "".join(rng.choices(noise, k=rng.randint(1, 8)))
+            parts.append(part)
+            length += len(part)
+        lines.append("".join(parts))
+    return join_lines(lines)
+
+
+def generate_day04(scale: float, rng: random.Random) -> str:
+    side = scaled_side(140, scale)
+    return join_rows([rng.choices("XMAS", k=side) for _ in range(side)])
+
+
+def generate_day05(scale: float, rng: random.Random) -> str:
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{before}|{after}" for before, after in itertools.combinations(pages, 2)]
+    rng.shuffle(rules)
+    updates: list[str] = []
+    for _ in range(scaled_count(200, scale)):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(str(page) for page in update))
+    return join_lines(rules + [""] + updates)
+
+
+def generate_day06(scale: float, rng: random.Random) -> str:
+    side = scaled_side(130, scale)
+    rows = [
+        ["#" if rng.random() < 0.05 else "." for _ in range(side)] for _ in range(side)
+    ]
+    guard_x, guard_y = rng.randrange(side), rng.randrange(side)
+    rows[guard_y][guard_x] = "^"
+    return join_rows(rows)
+
+
+def generate_day07(scale: float, rng: random.Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled_count(850, scale)):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        total = numbers[0]
+        for number in numbers[1:]:
+            match rng.randrange(3):
+                case 0:
+                    total += number
+                case 1:
+                    total *= number
+                case _:
+                    total = int(f"{total}{number}")
+        if rng.random() < 0.3:
+            total += 1
+        lines.append(f"{total}: {' '.join(str(number) for number in numbers)}")
+    return join_lines(lines)
+
+
+def generate_day08(scale: float, rng: random.Random) -> str:
+    side = scaled_side(50, scale)
+    rows = [["."] * side for _ in range(side)]
+    for _ in range(scaled_count(200, scale)):
+        rows[rng.randrange(side)][rng.randrange(side)] = rng.choice(FREQUENCIES)
+    return join_rows(rows)
+
+
+def generate_day10(scale: float, rng: random.Random) -> str:
+    side = scaled_side(45, scale)
+    rows = [rng.choices(string.digits, k=side) for _ in range(side)]
+    for _ in range(side * side // 20):
+        x, y = rng.randrange(side), rng.randrange(side)
+        for height in range(10):
+            rows[y][x] = str(height)
+            dx, dy = rng.choice(((0, -1), (1, 0), (0, 1), (-1, 0)))
+            x = min(side - 1, max(0, x + dx))
+            y = min(side - 1, max(0, y + dy))
+    return join_rows(rows)
+
+
+def generate_day11(scale: float, rng: random.Random) -> str:
+    return join_lines(
+        [" ".join(str(rng.randint(0, 999999)) for _ in range(scaled_count(8, scale)))]
+    )
+
+
+def generate_day12(scale: float, rng: random.Random) -> str:
+    side = scaled_side(140, scale)
+    block = 5
+    blocks = [
+        rng.choices(string.ascii_uppercase, k=side // block + 1)
+        for _ in range(side // block + 1)
+    ]
+    rows = [[blocks[y // block][x // block] for x in range(side)] for y in range(side)]
+    for _ in range(side * side // 3):
+        x, y = rng.randrange(1, side - 1), rng.randrange(1, side - 1)
+        dx, dy = rng.choice(((0, -1), (1, 0), (0, 1), (-1, 0)))
+        rows[y][x] = rows[y + dy][x + dx]
+    return join_rows(rows)
+
+
+def generate_day14(scale: float, rng: random.Random) -> str:
+    return join_lines(
+        f"p={rng.randrange(101)},{rng.randrange(103)} "
+        f"v={rng.randint(-100, 100)},{rng.randint(-100, 100)}"
+        for _ in range(scaled_count(500, scale))
+    )
+
+
+def generate_day15(scale: float, rng: random.Random) -> str:
+    side = scaled_side(50, scale, minimum=8)
+    rows = walled_rows(side)
+    for y in range(1, side - 1):
+        for x in range(1, side - 1):
+            roll = rng.random()
+            if roll < 0.05:
+                rows[y][x] = "#"
+            elif roll < 0.25:
+                rows[y][x] = "O"
+    rows[side // 2][side // 2] = "@"
+    moves = "".join(rng.choices(MOVES, k=scaled_count(20000, scale)))
+    move_lines = [moves[index : index + 1000] for index in range(0, len(moves), 1000)]
+    return join_lines(["".join(row) for row in rows] + [""] + move_lines)
+
+
+def generate_day16(scale: float, rng: random.Random) -> str:
+    side = odd(scaled_side(141, scale, minimum=7))
+    rows = carve_maze(side, rng)
+    for _ in range(side * side // 40):
+        x, y = rng.randrange(1, side - 1), rng.randrange(1, side - 1)
+        rows[y][x] = "."
+    rows[side - 2][1] = "S"
+    rows[1][side - 2] = "E"
+    return join_rows(rows)
+
+
+def generate_day18(scale: float, rng: random.Random) -> str:
+    locations = [
+        (x, y)
+        for x in range(DAY18_SIZE)
+        for y in range(DAY18_SIZE)
+        if (x, y) not in ((0, 0), (DAY18_SIZE - 1, DAY18_SIZE - 1))
+    ]
+    count = max(DAY18_FALLING_BYTES + 1, scaled_count(3450, scale))
+    count = min(len(locations), count)
+    return join_lines(f"{x},{y}" for x, y in rng.sample(locations, count))
+
+
+def generate_day19(scale: float, rng: random.Random) -> str:
+    patterns: set[str] = set()
+    while len(patterns) < 447:
+        patterns.add("".join(rng.choices(TOWEL_COLOURS, k=rng.randint(1, 8))))
+    pattern_list = sorted(patterns)
+    designs: list[str] = []
+    for _ in range(scaled_count(400, scale)):
+        if rng.random() < 0.2:
+            design = "".join(rng.choices(TOWEL_COLOURS, k=rng.randint(40, 60)))
+        else:
+            design = ""
+            while len(design) < 40:
+                design += rng.choice(pattern_list)
+        designs.append(design)
+    return join_lines([", ".join(pattern_list), ""] + designs)
+
+
+def generate_day20(scale: float, rng: random.Random) -> str:
+    side = odd(scaled_side(141, scale, minimum=7))
+    maze = carve_maze(side, rng)
+    start, end = (1, side - 2), (side - 2, 1)
+    rows = [["#"] * side for _ in range(side)]
+    for x, y in maze_path(maze, start, end):
+        rows[y][x] = "."
+    rows[start[1]][start[0]] = "S"
+    rows[end[1]][end[0]] = "E"
+    return join_rows(rows)
+
+
+def generate_day22(scale: float, rng: random.Random) -> str:
+    return join_lines(
+        str(rng.randint(1, 16777215)) for _ in range(scaled_count(2500, scale))
+    )
+
+
+def generate_day23(scale: float, rng: random.Random) -> str:
+    computer_qty = scaled_count(520, scale)
+    name_length = 2 if computer_qty <= 26 * 26 else 3
+    names = [
+        "".join(letters)
+        for letters in itertools.product(LOWERCASE_LETTERS, repeat=name_length)
+    ]
+    computers = rng.sample(names, computer_qty)
+    connections: set[frozenset[str]] = set()
+    party = rng.sample(computers, min(13, computer_qty))
+    connections.update(frozenset(pair) for pair in itertools.combinations(party, 2))
+    while len(connections) < computer_qty * 13 // 2:
+        pair = frozenset(rng.sample(computers, 2))
+        connections.add(pair)
+    lines = ["-".join(sorted(connection)) for connection in connections]
+    rng.shuffle(lines)
+    return join_lines(lines)
+
+
+def generate_day24(scale: float, rng: random.Random) -> str:
+    bits = scaled_count(45, scale)
+    width = max(2, len(str(bits)))
+    name_letters = "abcdefghijklmnopqrstuvw"
+    name_length = 3 if 3 * bits < len(name_letters) ** 3 else 4
+    names = (
+        "".join(letters)
+        for letters in itertools.product(name_letters, repeat=name_length)
+    )
+    initial_values = [
+        f"{wire}{bit:0{width}}: {rng.randint(0, 1)}"
+        for wire in "xy"
+        for bit in range(bits)
+    ]
+
+    gates: list[str] = []
+    carry = ""
+    for bit in range(bits):
+        x, y, z = (f"{wire}{bit:0{width}}" for wire in "xyz")
+        if bit == 0:
+            carry = next(names)
+            gates.append(f"{x} XOR {y} -> {z}")
+            gates.append(f"{x} AND {y} -> {carry}")
+            continue
+        half_sum, half_carry, carry_through = next(names), next(names), next(names)
+        next_carry = f"z{bits:0{width}}" if bit == bits - 1 else next(names)
+        gates.append(f"{x} XOR {y} -> {half_sum}")
+        gates.append(f"{x} AND {y} -> {half_carry}")
+        gates.append(f"{half_sum} XOR {carry} -> {z}")
+        gates.append(f"{half_sum} AND {carry} -> {carry_through}")
+        gates.append(f"{half_carry} OR {carry_through} -> {next_carry}")
+        carry = next_carry
+    rng.shuffle(gates)
+    return join_lines(initial_values + [""] + gates)
+
+
+def generate_day25(scale: float, rng: random.Random) -> str:
+    schematics: list[str] = []
+    for _ in range(scaled_count(500, scale)):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        is_lock = rng.random() < 0.5
+        rows: list[str] = []
+        for row in range(7):
+            if is_lock:
+                filled = [row <= height for height in heights]
+            else:
+                filled = [6 - row <= height for height in heights]
+            rows.append("".join("#" if cell else "." for cell in filled))
+        schematics.append("\n".join(rows))
+    return "\n\n".join(schematics) + "\n"
+
+
+GENERATORS: dict[int, Generator] = {
+    1: generate_day01,
+    2: generate_day02,
+    3: generate_day03,
+    4: generate_day04,
+    5: generate_day05,
+    6: generate_day06,
+    7: generate_day07,
+    8: generate_day08,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    14: generate_day14,
+    15: generate_day15,
+    16: generate_day16,
+    18: generate_day18,
+    19: generate_day19,
+    20: generate_day20,
+    22: generate_day22,
+    23: generate_day23,
+    24: generate_day24,
+    25: generate_day25,
+}
+
+
+def generate_input(day: int, scale: float = 1.0, seed: int = DEFAULT_SEED) -> str:
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator for day {day}")
+    return GENERATORS[day](scale, random.Random(f"{day}:{scale}:{seed}"))
+
+
+def write_input(
+    day: int, path: pathlib.Path, scale: float = 1.0, seed: int = DEFAULT_SEED
+) -> pathlib.Path:
+    path.write_text(generate_input(day, scale, seed))
+    return path
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic puzzle input scaled from the official size."
+    )
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=1.0,
+        help="size relative to the official input (default 1)",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("-o", "--output", type=pathlib.Path, help="input file")
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    if args.output:
+        write_input(args.day, args.output, args.scale, args.seed)
+    else:
+        sys.stdout.write(generate_input(args.day, args.scale, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import dataclasses
+import enum
+import typing
+
+
+_locations: dict[tuple[int, int], "Location"] = {}
+
+
+class Location:
+    __slots__ = ("x", "y")
+    x: int
+    y: int
+
+    def __new__(cls, x: int, y: int) -> "Location":
+        location = _locations.get((x, y))
+        if location is None:
+            location = object.__new__(cls)
+            object.__setattr__(location, "x", x)
+            object.__setattr__(location, "y", y)
+            _locations[(x, y)] = location
+        return location
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError(f"Location is immutable, cannot set {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Location is immutable, cannot delete {name}")
+
+    def __reduce__(self) -> tuple[type["Location"], tuple[int, int]]:
+        return Location, (self.x, self.y)
+
+    def __repr__(self) -> str:
+        return f"Location(x={self.x}, y={self.y})"
+
+    def neighbour_location(self, location_direction: "LocationDirection") -> "Location":
+        return Location(self.x + location_direction.dx, self.y + location_direction.dy)
+
+    def offset_by(self, differance: "Location") -> "Location":
+        return Location(self.x + differance.x, self.y + differance.y)
+
+    def differance(self, other: "Location") -> "Location":
+        return Location(self.x - other.x, self.y - other.y)
+
+    def distance(self, other_location: "Location") -> int:
+        return abs(self.x - other_location.x) + abs(self.y - other_location.y)
+
+    def __mul__(self, other: int) -> "Location":
+        return Location(self.x * other, self.y * other)
+
+
+@enum.unique
+class LocationDirection(enum.Enum):
+    UP = Location(0, -1)
+    RIGHT = Location(1, 0)
+    DOWN = Location(0, 1)
+    LEFT = Location(-1, 0)
+
+    def __init__(self, location: Location) -> None:
+        self.dx = location.x
+        self.dy = location.y
+
+    __hash__ = object.__hash__
+
+
+@enum.unique
+class LocationDirection8(enum.Enum):
+    UP = Location(0, -1)
+    UP_RIGHT = Location(1, -1)
+    RIGHT = Location(1, 0)
+    DOWN_RIGHT = Location(1, 1)
+    DOWN = Location(0, 1)
+    DOWN_LEFT = Location(-1, 1)
+    LEFT = Location(-1, 0)
+    UP_LEFT = Location(-1, -1)
+
+    def __init__(self, location: Location) -> None:
+        self.dx = location.x
+        self.dy = location.y
+
+    __hash__ = object.__hash__
+
+
+# Locations compare by identity, so clearing keeps the offsets the direction
+# enums hold; anything else interned by a finished job is dropped.
+_pinned_locations = dict(_locations)
+
+
+def clear_locations() -> None:
+    _locations.clear()
+    _locations.update(_pinned_locations)
+    return None
+
+
+LOCATION_DIRECTIONS: tuple[LocationDirection, ...] = tuple(LocationDirection)
+RIGHT_TURNS: dict[LocationDirection, LocationDirection] = {
+    location_direction: LOCATION_DIRECTIONS[(index + 1) % len(LOCATION_DIRECTIONS)]
+    for index, location_direction in enumerate(LOCATION_DIRECTIONS)
+}
+LEFT_TURNS: dict[LocationDirection, LocationDirection] = {
+    right_turn: location_direction
+    for location_direction, right_turn in RIGHT_TURNS.items()
+}
+
+
+DIRECTION_INDEXES: dict[LocationDirection, int] = {
+    location_direction: index
+    for index, location_direction in enumerate(LOCATION_DIRECTIONS)
+}
+
+
+# Every cell's neighbour in each of LOCATION_DIRECTIONS, in that order, with
+# None where the step would leave the grid. A cell's entry is filled the first
+# time it is visited, so walkers and searches that cross it again look the
+# step up instead of building and bounds checking it, and cells never reached
+# cost nothing.
+@dataclasses.dataclass
+class NeighbourTable:
+    width: int
+    height: int
+    neighbours: dict[Location, tuple[typing.Optional[Location], ...]] = (
+        dataclasses.field(default_factory=dict, repr=False)
+    )
+
+    def create_neighbours(
+        self, location: Location
+    ) -> tuple[typing.Optional[Location], ...]:
+        neighbours = tuple(
+            (
+                Location(location.x + direction.dx, location.y + direction.dy)
+                if 0 <= location.x + direction.dx < self.width
+                and 0 <= location.y + direction.dy < self.height
+                else None
+            )
+            for direction in LOCATION_DIRECTIONS
+        )
+        self.neighbours[location] = neighbours
+        return neighbours
+
+    def all_neighbours(
+        self, location: Location
+    ) -> tuple[typing.Optional[Location], ...]:
+        neighbours = self.neighbours.get(location)
+        if neighbours is None:
+            neighbours = self.create_neighbours(location)
+        return neighbours
+
+    def neighbour(
+        self, location: Location, location_direction: LocationDirection
+    ) -> typing.Optional[Location]:
+        return self.all_neighbours(location)[DIRECTION_INDEXES[location_direction]]
+
+    def directed_neighbours(
+        self, location: Location
+    ) -> typing.Iterator[tuple[LocationDirection, typing.Optional[Location]]]:
+        return zip(LOCATION_DIRECTIONS, self.all_neighbours(location))
+
+
+def fit_neighbour_table(
+    neighbour_table: typing.Optional[NeighbourTable], width: int, height: int
+) -> NeighbourTable:
+    if (
+        neighbour_table is None
+        or neighbour_table.width != width
+        or neighbour_table.height != height
+    ):
+        return NeighbourTable(width, height)
+    return neighbour_table
+
+
+def turn_right(location_direction: LocationDirection) -> LocationDirection:
+    return RIGHT_TURNS[location_direction]
+
+
+def turn_left(location_direction: LocationDirection) -> LocationDirection:
+    return LEFT_TURNS[location_direction]
+
+
+def location_id(location: Location, width: int) -> int:
+    return location.y * width + location.x
+
+
+def id_location(node: int, width: int) -> Location:
+    y, x = divmod(node, width)
+    return Location(x, y)
@@ -0,0 +1,156 @@
+import dataclasses
+import mmap
+import os
+import re
+import typing
+
+from dense_grid import OUT_OF_BOUNDS, DenseGrid, create_dense_grid
+
+
+LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+WHITESPACE: typing.Final[bytes] = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+Span = tuple[int, int]
+
+
+def find_line_spans(buffer: typing.Union[bytes, mmap.mmap]) -> list[Span]:
+    line_spans: list[Span] = []
+    start = 0
+    for match in LINE_BREAK.finditer(buffer):
+        line_spans.append(strip_span(buffer, start, match.start()))
+        start = match.end()
+    if start < len(buffer):
+        line_spans.append(strip_span(buffer, start, len(buffer)))
+    return line_spans
+
+
+def strip_span(buffer: typing.Union[bytes, mmap.mmap], start: int, end: int) -> Span:
+    while start < end and buffer[start] in WHITESPACE:
+        start += 1
+    while end > start and buffer[end - 1] in WHITESPACE:
+        end -= 1
+    return start, end
+
+
+@dataclasses.dataclass
+class InputFile:
+    filename: str
+    buffer: typing.Union[bytes, mmap.mmap]
+    line_spans: list[Span] = dataclasses.field(default_factory=list)
+    _text_lines: typing.Optional[list[str]] = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+    _content_hash: typing.Optional[str] = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.line_spans:
+            self.line_spans = find_line_spans(self.buffer)
+
+    def lines(self) -> list[memoryview]:
+        view = memoryview(self.buffer)
+        return [view[start:end] for start, end in self.line_spans]
+
+    @property
+    def text_lines(self) -> list[str]:
+        if self._text_lines is None:
+            self._text_lines = [
+                self.buffer[start:end].decode().strip()
+                for start, end in self.line_spans
+            ]
+        return self._text_lines
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            import hashlib
+
+            self._content_hash = hashlib.sha256(self.buffer).hexdigest()
+        return self._content_hash
+
+    def section_spans(self) -> list[list[Span]]:
+        sections: list[list[Span]] = []
+        section: list[Span] = []
+        for start, end in self.line_spans:
+            if start == end:
+                if section:
+                    sections.append(section)
+                    section = []
+                continue
+            section.append((start, end))
+        if section:
+            sections.append(section)
+        return sections
+
+    def sections(self) -> list[list[memoryview]]:
+        view = memoryview(self.buffer)
+        return [
+            [view[start:end] for start, end in section]
+            for section in self.section_spans()
+        ]
+
+    def text_sections(self) -> list[list[str]]:
+        return [
+            [self.buffer[start:end].decode().strip() for start, end in section]
+            for section in self.section_spans()
+        ]
+
+    def grid(
+        self, section_index: int = 0, out_of_bounds: int = OUT_OF_BOUNDS
+    ) -> DenseGrid:
+        return create_dense_grid(
+            self.sections()[section_index], out_of_bounds=out_of_bounds
+        )
+
+
+def read_input_file(filename: str, mapped: bool = True) -> InputFile:
+    with open(file=filename, mode="rb") as read_file:
+        if not mapped:
+            return InputFile(filename, read_file.read())
+        if os.fstat(read_file.fileno()).st_size == 0:
+            return InputFile(filename, b"")
+        buffer = mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return InputFile(filename, buffer)
+
+
+_input_files: dict[str, tuple[tuple[int, int], InputFile]] = {}
+
+
+def load_input(filename: str) -> InputFile:
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    file_version = (stat.st_mtime_ns, stat.st_size)
+    cached = _input_files.get(path)
+    if cached and cached[0] == file_version:
+        return cached[1]
+
+    input_file = read_input_file(path)
+    _input_files[path] = (file_version, input_file)
+    return input_file
+
+
+def prime_input(input_file: InputFile) -> None:
+    path = os.path.abspath(input_file.filename)
+    stat = os.stat(path)
+    _input_files[path] = ((stat.st_mtime_ns, stat.st_size), input_file)
+    return None
+
+
+def clear_input_cache() -> None:
+    _input_files.clear()
+    return None
+
+
+def yield_data(filename: str) -> typing.Iterator[str]:
+    yield from load_input(filename).text_lines
+
+
+def stream_data(filename: str) -> typing.Iterator[str]:
+    with open(filename) as read_file:
+        for line in read_file:
+            yield line.strip()
+
+
+def read_sections(filename: str) -> list[list[str]]:
+    return load_input(filename).text_sections()
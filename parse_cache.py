@@ -0,0 +1,218 @@
+import dataclasses
+import os
+import pathlib
+import sys
+import types
+import typing
+
+from loader import load_input, yield_data
+
+
+ENABLED_VARIABLE = "AOC_PARSE_CACHE"
+DIRECTORY_VARIABLE = "AOC_PARSE_CACHE_DIR"
+MAX_BYTES_VARIABLE = "AOC_PARSE_CACHE_MAX_BYTES"
+REPO_DIRECTORY = pathlib.Path(__file__).resolve().parent
+DEFAULT_DIRECTORY = REPO_DIRECTORY / ".parse_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 256
+CACHE_SUFFIX = ".pickle"
+PICKLE_PROTOCOL = 5
+
+T = typing.TypeVar("T")
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheEntry:
+    path: pathlib.Path
+    size: int
+    last_used: int
+
+
+_source_digests: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def source_digest(filename: str) -> str:
+    import hashlib
+
+    stat = os.stat(filename)
+    file_version = (stat.st_mtime_ns, stat.st_size)
+    cached = _source_digests.get(filename)
+    if cached and cached[0] == file_version:
+        return cached[1]
+
+    with open(filename, "rb") as read_file:
+        digest = hashlib.sha256(read_file.read()).hexdigest()
+    _source_digests[filename] = (file_version, digest)
+    return digest
+
+
+def repo_module_file(module_name: typing.Optional[str]) -> typing.Optional[str]:
+    module = sys.modules.get(module_name or "")
+    filename = getattr(module, "__file__", None)
+    if (
+        filename is None
+        or REPO_DIRECTORY not in pathlib.Path(filename).resolve().parents
+    ):
+        return None
+    return filename
+
+
+# The classes a parser builds are usually defined next to it or in a shared
+# repo module it imports, such as geometry or dense_grid. Their source is part
+# of the key, so a pickle whose classes have since changed shape is never
+# loaded into code that expects the new fields.
+def parser_source_digests(parser: typing.Callable[..., typing.Any]) -> list[str]:
+    module_names = {parser.__module__}
+    for value in vars(sys.modules[parser.__module__]).values():
+        if isinstance(value, types.ModuleType):
+            module_names.add(value.__name__)
+        elif isinstance(getattr(value, "__module__", None), str):
+            module_names.add(value.__module__)
+    filenames = sorted(filter(None, map(repo_module_file, module_names)))
+    return [source_digest(filename) for filename in filenames]
+
+
+@dataclasses.dataclass
+class ParseCache:
+    directory: pathlib.Path = DEFAULT_DIRECTORY
+    max_bytes: int = DEFAULT_MAX_BYTES
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    hits: int = 0
+    misses: int = 0
+
+    def key(
+        self,
+        filename: str,
+        parser: typing.Callable[..., typing.Any],
+        args: tuple[typing.Any, ...],
+        version: int,
+    ) -> str:
+        import hashlib
+
+        parser_identity = (
+            parser.__module__,
+            parser.__qualname__,
+            version,
+            parser_source_digests(parser),
+            args,
+            sys.version_info[:2],
+            PICKLE_PROTOCOL,
+        )
+        digest = hashlib.sha256(load_input(filename).content_hash.encode())
+        digest.update(repr(parser_identity).encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> tuple[bool, typing.Any]:
+        import pickle
+
+        path = self.path(key)
+        try:
+            with open(path, "rb") as read_file:
+                value = pickle.load(read_file)
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except Exception:
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return False, None
+
+        os.utime(path)
+        self.hits += 1
+        return True, value
+
+    def put(self, key: str, value: typing.Any) -> bool:
+        import pickle
+        import tempfile
+
+        try:
+            payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        if len(payload) > self.max_bytes:
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_name = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as write_file:
+                write_file.write(payload)
+            os.replace(temporary_name, self.path(key))
+        except BaseException:
+            os.unlink(temporary_name)
+            raise
+        self.evict()
+        return True
+
+    def entries(self) -> list[CacheEntry]:
+        entries: list[CacheEntry] = []
+        if not self.directory.is_dir():
+            return entries
+        for path in self.directory.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(CacheEntry(path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def evict(self) -> None:
+        entries = sorted(self.entries(), key=lambda entry: entry.last_used)
+        total_bytes = sum(entry.size for entry in entries)
+        while entries and (
+            total_bytes > self.max_bytes or len(entries) > self.max_entries
+        ):
+            entry = entries.pop(0)
+            entry.path.unlink(missing_ok=True)
+            total_bytes -= entry.size
+        return None
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            entry.path.unlink(missing_ok=True)
+        return None
+
+
+def parse_cache_enabled() -> bool:
+    return os.environ.get(ENABLED_VARIABLE, "") not in ("", "0")
+
+
+_parse_cache: typing.Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _parse_cache
+    directory = pathlib.Path(os.environ.get(DIRECTORY_VARIABLE, DEFAULT_DIRECTORY))
+    max_bytes = int(os.environ.get(MAX_BYTES_VARIABLE, DEFAULT_MAX_BYTES))
+    if (
+        _parse_cache is None
+        or _parse_cache.directory != directory
+        or _parse_cache.max_bytes != max_bytes
+    ):
+        _parse_cache = ParseCache(directory, max_bytes)
+    return _parse_cache
+
+
+def load_parsed(
+    filename: str,
+    parser: typing.Callable[..., T],
+    *args: typing.Any,
+    version: int = 1,
+) -> T:
+    if not parse_cache_enabled():
+        return parser(yield_data(filename), *args)
+
+    parse_cache = get_parse_cache()
+    key = parse_cache.key(filename, parser, args, version)
+    found, value = parse_cache.get(key)
+    if found:
+        return value
+
+    value = parser(yield_data(filename), *args)
+    parse_cache.put(key, value)
+    return value
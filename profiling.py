@@ -0,0 +1,169 @@
+import collections
+import contextlib
+import cProfile
+import dataclasses
+import inspect
+import os
+import pathlib
+import pstats
+import signal
+import types
+import typing
+
+from runner import PROFILERS
+
+
+PSTATS_SUFFIX = ".pstats"
+COLLAPSED_SUFFIX = ".collapsed"
+SAMPLE_INTERVAL = 0.001
+TOP_FUNCTIONS = 10
+
+
+@dataclasses.dataclass(frozen=True)
+class HotFunction:
+    name: str
+    filename: str
+    line: int
+    own_time: float
+    cumulative_time: float
+    calls: typing.Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({os.path.basename(self.filename)}:{self.line})"
+
+    def __str__(self) -> str:
+        calls = f" {self.calls} calls" if self.calls is not None else ""
+        return (
+            f"{self.label} own {self.own_time:.4f}s "
+            f"cumulative {self.cumulative_time:.4f}s{calls}"
+        )
+
+
+def frame_label(code: types.CodeType) -> str:
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+@dataclasses.dataclass
+class SamplingProfiler:
+    interval: float = SAMPLE_INTERVAL
+    root: typing.Optional[types.FrameType] = None
+    stacks: collections.Counter[tuple[types.CodeType, ...]] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    def sample(self, signum: int, frame: typing.Optional[types.FrameType]) -> None:
+        codes: list[types.CodeType] = []
+        while frame is not None and frame is not self.root:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        if codes:
+            self.stacks[tuple(reversed(codes))] += 1
+        return None
+
+    @contextlib.contextmanager
+    def running(self) -> typing.Iterator["SamplingProfiler"]:
+        previous_handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            yield self
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous_handler)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed_stacks(self) -> collections.Counter[str]:
+        collapsed: collections.Counter[str] = collections.Counter()
+        for codes, count in self.stacks.items():
+            collapsed[";".join(frame_label(code) for code in codes)] += count
+        return collapsed
+
+    def write_collapsed(self, path: pathlib.Path) -> None:
+        with open(path, "w") as write_file:
+            for stack, count in sorted(self.collapsed_stacks().items()):
+                write_file.write(f"{stack} {count}\n")
+        return None
+
+    def hot_functions(self, limit: int = TOP_FUNCTIONS) -> list[HotFunction]:
+        own_samples: collections.Counter[types.CodeType] = collections.Counter()
+        cumulative_samples: collections.Counter[types.CodeType] = collections.Counter()
+        for codes, count in self.stacks.items():
+            own_samples[codes[-1]] += count
+            for code in set(codes):
+                cumulative_samples[code] += count
+
+        return [
+            HotFunction(
+                code.co_qualname,
+                code.co_filename,
+                code.co_firstlineno,
+                count * self.interval,
+                cumulative_samples[code] * self.interval,
+            )
+            for code, count in own_samples.most_common(limit)
+        ]
+
+
+def hot_functions_from_stats(
+    stats: pstats.Stats, limit: int = TOP_FUNCTIONS
+) -> list[HotFunction]:
+    rows = sorted(
+        stats.stats.items(),
+        key=lambda item: item[1][2],
+        reverse=True,
+    )[:limit]
+    return [
+        HotFunction(name, filename, line, own_time, cumulative_time, calls)
+        for (filename, line, name), (_, calls, own_time, cumulative_time, _) in rows
+    ]
+
+
+def profile_with_cprofile(
+    function: typing.Callable[[], typing.Any], path: pathlib.Path, limit: int
+) -> list[HotFunction]:
+    profile = cProfile.Profile()
+    try:
+        profile.runcall(function)
+    finally:
+        profile.dump_stats(path)
+    return hot_functions_from_stats(pstats.Stats(profile), limit)
+
+
+def profile_with_sampling(
+    function: typing.Callable[[], typing.Any], path: pathlib.Path, limit: int
+) -> list[HotFunction]:
+    profiler = SamplingProfiler(root=inspect.currentframe())
+    try:
+        with profiler.running():
+            function()
+    finally:
+        profiler.write_collapsed(path)
+    return profiler.hot_functions(limit)
+
+
+def profile_part(
+    function: typing.Callable[[], typing.Any],
+    directory: pathlib.Path,
+    stem: str,
+    profiler: str = "both",
+    limit: int = TOP_FUNCTIONS,
+) -> list[HotFunction]:
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profiler}")
+    directory.mkdir(parents=True, exist_ok=True)
+
+    hot_functions: list[HotFunction] = []
+    if profiler in ("cprofile", "both"):
+        hot_functions = profile_with_cprofile(
+            function, directory / f"{stem}{PSTATS_SUFFIX}", limit
+        )
+    if profiler in ("sampling", "both"):
+        sampled_hot_functions = profile_with_sampling(
+            function, directory / f"{stem}{COLLAPSED_SUFFIX}", limit
+        )
+        hot_functions = hot_functions or sampled_hot_functions
+    return hot_functions
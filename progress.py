@@ -0,0 +1,121 @@
+import dataclasses
+import os
+import sys
+import time
+import typing
+
+
+PROGRESS_VARIABLE = "AOC_PROGRESS"
+REPORT_INTERVAL = 1.0
+
+
+@dataclasses.dataclass
+class Progress:
+    label: str
+    total: typing.Optional[int] = None
+    interval: float = REPORT_INTERVAL
+    output: typing.TextIO = dataclasses.field(default_factory=lambda: sys.stderr)
+    count: int = 0
+    values: dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+    last_report: float = dataclasses.field(default_factory=time.perf_counter)
+    next_clock_check: int = 1
+
+    def __enter__(self) -> "Progress":
+        return self
+
+    def __exit__(
+        self, exc_type: typing.Optional[type[BaseException]], *exc_info: typing.Any
+    ) -> None:
+        self.finish("interrupted" if exc_type else "done")
+        return None
+
+    def advance(self, amount: int = 1, **values: typing.Any) -> None:
+        self.count += amount
+        if values:
+            self.values.update(values)
+        if self.count < self.next_clock_check:
+            return None
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.report(now)
+        self.schedule_clock_check(now)
+        return None
+
+    def schedule_clock_check(self, now: float) -> None:
+        elapsed = now - self.started
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        checks_per_interval = max(1, int(rate * self.interval / 4))
+        self.next_clock_check = self.count + checks_per_interval
+        return None
+
+    def elapsed(self, now: typing.Optional[float] = None) -> float:
+        return (now or time.perf_counter()) - self.started
+
+    def rate(self, now: typing.Optional[float] = None) -> float:
+        elapsed = self.elapsed(now)
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def eta(self, now: typing.Optional[float] = None) -> typing.Optional[float]:
+        rate = self.rate(now)
+        if self.total is None or rate == 0:
+            return None
+        return max(0, self.total - self.count) / rate
+
+    def summary(self, now: typing.Optional[float] = None) -> str:
+        count = (
+            f"{self.count}/{self.total}" if self.total is not None else f"{self.count}"
+        )
+        parts = [f"{self.label}: {count}", f"{self.rate(now):.1f}/s"]
+        if self.total:
+            parts.append(f"{100 * self.count / self.total:.1f}%")
+        eta = self.eta(now)
+        if eta is not None:
+            parts.append(f"eta {eta:.1f}s")
+        parts.extend(f"{name}={value}" for name, value in self.values.items())
+        return " ".join(parts)
+
+    def report(self, now: typing.Optional[float] = None) -> None:
+        now = now or time.perf_counter()
+        self.last_report = now
+        self.output.write(f"{self.summary(now)}\n")
+        self.output.flush()
+        return None
+
+    def finish(self, state: str = "done") -> None:
+        now = time.perf_counter()
+        self.output.write(f"{self.summary(now)} {state} in {self.elapsed(now):.2f}s\n")
+        self.output.flush()
+        return None
+
+
+class DisabledProgress:
+    def __enter__(self) -> "DisabledProgress":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        return None
+
+    def advance(self, amount: int = 1, **values: typing.Any) -> None:
+        return None
+
+    def finish(self, state: str = "done") -> None:
+        return None
+
+
+DISABLED_PROGRESS = DisabledProgress()
+
+
+def progress_enabled() -> bool:
+    return os.environ.get(PROGRESS_VARIABLE, "") not in ("", "0")
+
+
+def create_progress(
+    label: str,
+    total: typing.Optional[int] = None,
+    interval: float = REPORT_INTERVAL,
+) -> typing.Union[Progress, DisabledProgress]:
+    if not progress_enabled():
+        return DISABLED_PROGRESS
+    return Progress(label, total, interval)
@@ -0,0 +1,350 @@
+import argparse
+import dataclasses
+import json
+import os
+import pathlib
+import sys
+import typing
+
+from generators import GENERATORS, write_input
+from runner import (
+    PARTS,
+    REPO_DIRECTORY,
+    DayModule,
+    PartResult,
+    Task,
+    discover_day_modules,
+    load_day_module,
+    run_tasks,
+    select_day_modules,
+)
+
+
+GOLDEN_PATH = REPO_DIRECTORY / "golden.json"
+VARIANTS = ("test", "real", "generated")
+GENERATED_SCALE = 0.25
+DEFAULT_MAX_WALL_TIME = 10.0
+DEFAULT_MAX_PEAK_RSS_KB = 1024 * 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    max_wall_time: float = DEFAULT_MAX_WALL_TIME
+    max_peak_rss_kb: int = DEFAULT_MAX_PEAK_RSS_KB
+
+
+@dataclasses.dataclass
+class GoldenPart:
+    answer: typing.Optional[str] = None
+    max_wall_time: typing.Optional[float] = None
+    max_peak_rss_kb: typing.Optional[int] = None
+    skip: typing.Optional[str] = None
+
+    def budget(self, defaults: Budget) -> Budget:
+        return Budget(
+            self.max_wall_time or defaults.max_wall_time,
+            self.max_peak_rss_kb or defaults.max_peak_rss_kb,
+        )
+
+
+@dataclasses.dataclass
+class Golden:
+    defaults: Budget = dataclasses.field(default_factory=Budget)
+    modules: dict[str, dict[str, dict[str, GoldenPart]]] = dataclasses.field(
+        default_factory=dict
+    )
+
+    def part(self, module: str, variant: str, part: int) -> GoldenPart:
+        variants = self.modules.setdefault(module, {})
+        parts = variants.setdefault(variant, {})
+        return parts.setdefault(str(part), GoldenPart())
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        return {
+            "defaults": dataclasses.asdict(self.defaults),
+            "modules": {
+                module: {
+                    variant: {
+                        part: {
+                            name: value
+                            for name, value in dataclasses.asdict(golden_part).items()
+                            if value is not None
+                        }
+                        for part, golden_part in sorted(parts.items())
+                    }
+                    for variant, parts in sorted(variants.items())
+                }
+                for module, variants in sorted(self.modules.items())
+            },
+        }
+
+
+@dataclasses.dataclass
+class Check:
+    variant: str
+    filename: str
+    result: PartResult
+    expected: typing.Optional[str]
+    budget: Budget
+    allow_missing: bool = False
+    skip: typing.Optional[str] = None
+    problems: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.problems
+
+    def evaluate(self) -> None:
+        result = self.result
+        if not result.passed:
+            self.problems.append(f"error {result.error}")
+            return None
+        if self.expected is None:
+            if not self.allow_missing:
+                self.problems.append("no golden answer")
+        elif result.answer != self.expected:
+            self.problems.append(f"answer {result.answer!r} != {self.expected!r}")
+        if result.wall_time > self.budget.max_wall_time:
+            self.problems.append(
+                f"wall time {result.wall_time:.3f}s > {self.budget.max_wall_time}s"
+            )
+        if result.peak_rss_kb > self.budget.max_peak_rss_kb:
+            self.problems.append(
+                f"peak RSS {result.peak_rss_kb} KiB"
+                f" > {self.budget.max_peak_rss_kb} KiB"
+            )
+        return None
+
+
+def load_golden(path: pathlib.Path = GOLDEN_PATH) -> Golden:
+    if not path.exists():
+        return Golden()
+    with open(path) as read_file:
+        data = json.load(read_file)
+    return Golden(
+        Budget(**data.get("defaults", {})),
+        {
+            module: {
+                variant: {
+                    part: GoldenPart(**golden_part)
+                    for part, golden_part in parts.items()
+                }
+                for variant, parts in variants.items()
+            }
+            for module, variants in data.get("modules", {}).items()
+        },
+    )
+
+
+def write_golden(golden: Golden, path: pathlib.Path = GOLDEN_PATH) -> None:
+    with open(path, "w") as write_file:
+        json.dump(golden.as_dict(), write_file, indent=2)
+        write_file.write("\n")
+    return None
+
+
+def generated_filename(
+    day_module: DayModule, directory: pathlib.Path
+) -> typing.Optional[str]:
+    filename = getattr(load_day_module(day_module), "FILENAME", None)
+    if day_module.day not in GENERATORS or not filename:
+        return None
+    path = directory / os.path.basename(filename)
+    if not path.exists():
+        write_input(day_module.day, path, GENERATED_SCALE)
+    return str(path)
+
+
+def variant_filename(
+    day_module: DayModule, variant: str, generated_directory: pathlib.Path
+) -> typing.Optional[str]:
+    if variant == "generated":
+        return generated_filename(day_module, generated_directory)
+    module = load_day_module(day_module)
+    if variant == "test":
+        return getattr(module, "TEST_FILENAME", None)
+    return getattr(module, "FILENAME", None)
+
+
+def create_checks(
+    day_modules: list[DayModule],
+    variants: typing.Sequence[str],
+    parts: typing.Sequence[int],
+    golden: Golden,
+    generated_directory: pathlib.Path,
+    allow_missing: bool = False,
+) -> list[tuple[Task, Check]]:
+    checks: list[tuple[Task, Check]] = []
+    for day_module in day_modules:
+        for variant in variants:
+            filename = variant_filename(day_module, variant, generated_directory)
+            if not filename or not os.path.exists(filename):
+                continue
+            for part in parts:
+                golden_part = golden.part(day_module.label, variant, part)
+                timeout = golden_part.budget(golden.defaults).max_wall_time * 2
+                task = Task(
+                    day_module,
+                    part,
+                    filename if variant == "generated" else None,
+                    trace_memory=False,
+                    timeout=timeout,
+                    test_input=variant == "test",
+                )
+                result = PartResult(day_module.day, day_module.label, part)
+                check = Check(
+                    variant,
+                    filename,
+                    result,
+                    golden_part.answer,
+                    golden_part.budget(golden.defaults),
+                    allow_missing,
+                    golden_part.skip,
+                )
+                checks.append((task, check))
+    return checks
+
+
+def record_answers(golden: Golden, checks: list[Check]) -> None:
+    for check in checks:
+        if check.result.passed and not check.skip:
+            result = check.result
+            golden.part(result.module, check.variant, result.part).answer = (
+                result.answer
+            )
+    return None
+
+
+def write_checks(checks: list[Check], output: typing.TextIO) -> None:
+    for check in checks:
+        result = check.result
+        status = "ok" if check.passed else "FAIL " + "; ".join(check.problems)
+        if check.passed and check.expected is None:
+            status = "ok (no golden answer)"
+        if check.skip:
+            status = f"skipped ({check.skip})"
+        output.write(
+            f"{result.module:32} {check.variant:9} part {result.part} "
+            f"{result.wall_time:9.3f}s {result.peak_rss_kb:>9} KiB  {status}\n"
+        )
+    return None
+
+
+# A day module may define cross_check(), yielding a problem for each result
+# that disagrees with a slower reference, to cover paths no answer reaches.
+def run_cross_checks(day_modules: list[DayModule], output: typing.TextIO) -> bool:
+    passed = True
+    for day_module in day_modules:
+        cross_check = getattr(load_day_module(day_module), "cross_check", None)
+        if cross_check is None:
+            continue
+        problems = list(cross_check())
+        status = "ok" if not problems else "FAIL " + "; ".join(problems[:3])
+        if len(problems) > 3:
+            status += f" and {len(problems) - 3} more"
+        output.write(f"{day_module.label:32} cross-check  {status}\n")
+        passed = passed and not problems
+    return passed
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Check answers against golden values and per-part budgets."
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to check")
+    parser.add_argument(
+        "-p",
+        "--part",
+        dest="parts",
+        action="append",
+        type=int,
+        choices=sorted(PARTS),
+        help="part to check, may be repeated (default both)",
+    )
+    parser.add_argument(
+        "-m", "--module", help="only check modules whose file name contains this"
+    )
+    parser.add_argument(
+        "-v",
+        "--variant",
+        dest="variants",
+        action="append",
+        choices=VARIANTS,
+        help=(
+            "input to check, may be repeated (default all); generated inputs "
+            f"come from generators.py at scale {GENERATED_SCALE:g} and its default seed"
+        ),
+    )
+    parser.add_argument(
+        "-i",
+        "--input-directory",
+        type=pathlib.Path,
+        help="directory containing the puzzle input files",
+    )
+    parser.add_argument(
+        "-g", "--golden", type=pathlib.Path, default=GOLDEN_PATH, help="golden file"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes to run parts in, 0 for one per CPU (default 1)",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="store the answers of parts that ran as the new golden answers",
+    )
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="pass parts that have no golden answer instead of failing them",
+    )
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    day_modules = select_day_modules(discover_day_modules(), args.days, args.module)
+    if not day_modules:
+        print("No day modules selected", file=sys.stderr)
+        return 1
+    golden_path = args.golden.resolve()
+    golden = load_golden(golden_path)
+    if args.input_directory:
+        os.chdir(args.input_directory)
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="aoc_generated_") as generated_directory:
+        task_checks = create_checks(
+            day_modules,
+            args.variants or VARIANTS,
+            args.parts or sorted(PARTS),
+            golden,
+            pathlib.Path(generated_directory),
+            args.allow_missing or args.record,
+        )
+        if not task_checks:
+            print("No input files found", file=sys.stderr)
+            return 1
+        checks = [check for _, check in task_checks]
+        task_checks = [(task, check) for task, check in task_checks if not check.skip]
+        tasks = [task for task, _ in task_checks]
+        run_checks = [check for _, check in task_checks]
+        for check, result in zip(run_checks, run_tasks(tasks, args.jobs)):
+            check.result = result
+            check.evaluate()
+
+    write_checks(checks, sys.stdout)
+    cross_checked = run_cross_checks(day_modules, sys.stdout)
+    if args.record:
+        record_answers(golden, checks)
+        write_golden(golden, golden_path)
+        return 0
+    return 0 if cross_checked and all(check.passed for check in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
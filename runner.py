@@ -0,0 +1,594 @@
+import argparse
+import collections
+import contextlib
+import csv
+import dataclasses
+import importlib.machinery
+import importlib.util
+import json
+import os
+import pathlib
+import platform
+import re
+import resource
+import signal
+import sys
+import time
+import tracemalloc
+import types
+import typing
+
+from parse_cache import DIRECTORY_VARIABLE, ENABLED_VARIABLE
+from progress import PROGRESS_VARIABLE
+
+
+REPO_DIRECTORY = pathlib.Path(__file__).resolve().parent
+DAY_MODULE_PATTERN = re.compile(r"^day(\d+)\D")
+PARTS: dict[int, str] = {1: "part_one", 2: "part_two"}
+PARENT_TIMEOUT_SLACK = 5.0
+PROFILERS = ("cprofile", "sampling", "both")
+RESULT_FIELDS = (
+    "day",
+    "module",
+    "part",
+    "answer",
+    "error",
+    "wall_time",
+    "cpu_time",
+    "peak_rss_kb",
+    "tracemalloc_peak",
+    "hot_functions",
+)
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class DayModule:
+    day: int
+    path: pathlib.Path
+
+    @property
+    def label(self) -> str:
+        return self.path.name
+
+    @property
+    def module_name(self) -> str:
+        name = re.sub(r"\W+", "_", self.path.name.removesuffix(".py")).strip("_")
+        return f"aoc_{name.lower()}"
+
+
+@dataclasses.dataclass(frozen=True)
+class Task:
+    day_module: DayModule
+    part: int
+    filename: typing.Optional[str] = None
+    trace_memory: bool = True
+    timeout: typing.Optional[float] = None
+    profile_directory: typing.Optional[pathlib.Path] = None
+    profiler: str = "both"
+    test_input: bool = False
+
+
+@dataclasses.dataclass
+class PartResult:
+    day: int
+    module: str
+    part: int
+    answer: typing.Optional[str] = None
+    error: typing.Optional[str] = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_rss_kb: int = 0
+    tracemalloc_peak: typing.Optional[int] = None
+    hot_functions: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+
+def discover_day_modules(
+    directory: pathlib.Path = REPO_DIRECTORY,
+) -> list[DayModule]:
+    day_modules: list[DayModule] = []
+    for path in directory.glob("day*"):
+        if not path.is_file() or path.suffix not in ("", ".py"):
+            continue
+        match = DAY_MODULE_PATTERN.match(path.name)
+        if not match:
+            continue
+        day_modules.append(DayModule(int(match.group(1)), path))
+    day_modules.sort()
+    return day_modules
+
+
+def select_day_modules(
+    day_modules: list[DayModule],
+    days: typing.Sequence[int] = (),
+    module_filter: typing.Optional[str] = None,
+) -> list[DayModule]:
+    selected: list[DayModule] = []
+    for day_module in day_modules:
+        if days and day_module.day not in days:
+            continue
+        if module_filter and module_filter not in day_module.label:
+            continue
+        selected.append(day_module)
+    return selected
+
+
+_loaded_modules: dict[pathlib.Path, types.ModuleType] = {}
+
+
+def load_day_module(day_module: DayModule) -> types.ModuleType:
+    if day_module.path in _loaded_modules:
+        return _loaded_modules[day_module.path]
+
+    if str(day_module.path.parent) not in sys.path:
+        sys.path.insert(0, str(day_module.path.parent))
+    loader = importlib.machinery.SourceFileLoader(
+        day_module.module_name, str(day_module.path)
+    )
+    spec = importlib.util.spec_from_loader(day_module.module_name, loader)
+    if not spec:
+        raise ImportError(f"Cannot load {day_module.label}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[day_module.module_name] = module
+    try:
+        loader.exec_module(module)
+    except BaseException:
+        del sys.modules[day_module.module_name]
+        raise
+    _loaded_modules[day_module.path] = module
+    return module
+
+
+@contextlib.contextmanager
+def module_values(
+    module: types.ModuleType, values: dict[str, typing.Any]
+) -> typing.Iterator[None]:
+    saved_values = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved_values.items():
+            setattr(module, name, value)
+
+
+def input_filename(
+    module: types.ModuleType, filename: typing.Optional[str]
+) -> typing.ContextManager[None]:
+    if not filename:
+        return contextlib.nullcontext()
+    values: dict[str, typing.Any] = {"FILENAME": filename}
+    file_defaults = getattr(module, "FILE_DEFAULTS", None)
+    if dataclasses.is_dataclass(file_defaults) and hasattr(file_defaults, "filename"):
+        values["FILE_DEFAULTS"] = dataclasses.replace(file_defaults, filename=filename)
+    return module_values(module, values)
+
+
+def test_input(module: types.ModuleType, enabled: bool) -> typing.ContextManager[None]:
+    if not enabled:
+        return contextlib.nullcontext()
+    values: dict[str, typing.Any] = {"FILENAME": module.TEST_FILENAME}
+    if hasattr(module, "TEST_FILE_DEFAULTS"):
+        values["FILE_DEFAULTS"] = module.TEST_FILE_DEFAULTS
+    return module_values(module, values)
+
+
+def peak_rss_kb() -> int:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_rss // 1024
+    return peak_rss
+
+
+@contextlib.contextmanager
+def time_limit(seconds: typing.Optional[float]) -> typing.Iterator[None]:
+    if not seconds:
+        yield
+        return
+
+    def raise_timeout(signum: int, frame: typing.Optional[types.FrameType]) -> None:
+        raise TimeoutError(f"part exceeded {seconds}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def call_part(function: typing.Callable[[], typing.Any]) -> typing.Any:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return function()
+
+
+def run_task(task: Task) -> PartResult:
+    day_module = task.day_module
+    result = PartResult(day_module.day, day_module.label, task.part)
+    try:
+        module = load_day_module(day_module)
+        function = getattr(module, PARTS[task.part])
+        if task.test_input and not hasattr(module, "TEST_FILENAME"):
+            raise AttributeError(f"{day_module.label} has no TEST_FILENAME")
+    except Exception as error:
+        result.error = f"{type(error).__name__}: {error}"
+        return result
+
+    with test_input(module, task.test_input), input_filename(module, task.filename):
+        measure_part(function, result, task.trace_memory, task.timeout)
+        if task.profile_directory and result.passed:
+            profile_task(task, function, result)
+    return result
+
+
+def profile_task(
+    task: Task, function: typing.Callable[[], typing.Any], result: PartResult
+) -> None:
+    if not task.profile_directory:
+        return None
+    # cProfile, pstats and inspect are slow to import, so only profiled runs pay.
+    from profiling import profile_part
+
+    stem = f"{task.day_module.module_name}_part{task.part}"
+    try:
+        with time_limit(task.timeout):
+            hot_functions = call_part(
+                lambda: profile_part(
+                    function, task.profile_directory, stem, task.profiler
+                )
+            )
+    except Exception as error:
+        result.error = f"profiling failed: {type(error).__name__}: {error}"
+    else:
+        result.hot_functions = [str(hot_function) for hot_function in hot_functions]
+    return None
+
+
+def measure_part(
+    function: typing.Callable[[], typing.Any],
+    result: PartResult,
+    trace_memory: bool,
+    timeout: typing.Optional[float] = None,
+) -> None:
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with time_limit(timeout):
+            answer = call_part(function)
+    except Exception as error:
+        result.error = f"{type(error).__name__}: {error}"
+    else:
+        result.answer = str(answer)
+    result.wall_time = time.perf_counter() - wall_start
+    result.cpu_time = time.process_time() - cpu_start
+    result.peak_rss_kb = peak_rss_kb()
+
+    if trace_memory and result.passed:
+        tracemalloc.start()
+        try:
+            with time_limit(timeout):
+                call_part(function)
+        except Exception:
+            pass
+        else:
+            _, result.tracemalloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return None
+
+
+def create_tasks(
+    day_modules: list[DayModule],
+    parts: typing.Sequence[int],
+    filename: typing.Optional[str] = None,
+    trace_memory: bool = True,
+    timeout: typing.Optional[float] = None,
+    profile_directory: typing.Optional[pathlib.Path] = None,
+    profiler: str = "both",
+    test_input: bool = False,
+) -> list[Task]:
+    return [
+        Task(
+            day_module,
+            part,
+            filename,
+            trace_memory,
+            timeout,
+            profile_directory,
+            profiler,
+            test_input,
+        )
+        for day_module in day_modules
+        for part in parts
+    ]
+
+
+def failed_result(task: Task, error: BaseException) -> PartResult:
+    day_module = task.day_module
+    return PartResult(
+        day_module.day,
+        day_module.label,
+        task.part,
+        error=f"{type(error).__name__}: {error}",
+    )
+
+
+def parent_timeout(task: Task) -> typing.Optional[float]:
+    if not task.timeout:
+        return None
+    # The part may run up to three times: measured, traced and profiled.
+    runs = 1 + task.trace_memory + bool(task.profile_directory)
+    return task.timeout * runs + PARENT_TIMEOUT_SLACK
+
+
+def kill_workers() -> None:
+    import multiprocessing
+
+    for process in multiprocessing.active_children():
+        process.kill()
+    return None
+
+
+# ru_maxrss is a high-water mark for the whole process, so every part runs in
+# a fresh worker or it would report the peak of the heaviest part before it.
+# SIGALRM cannot interrupt a part blocked in C code, so the parent also
+# enforces a deadline and kills the workers when one passes. A worker that
+# dies breaks the whole pool, so the pool is rebuilt and unfinished parts are
+# resubmitted; parts that were running together when it broke rerun one at a
+# time until the crash can be pinned on a single part.
+def run_tasks(tasks: list[Task], jobs: int = 1) -> typing.Iterator[PartResult]:
+    import concurrent.futures
+    import concurrent.futures.process
+
+    workers = jobs or os.cpu_count() or 1
+    waiting = collections.deque(range(len(tasks)))
+    suspects: collections.deque[int] = collections.deque()
+    results: dict[int, PartResult] = {}
+    next_index = 0
+    while waiting or suspects:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, max_tasks_per_child=1
+        ) as executor:
+            running: dict[
+                "concurrent.futures.Future[PartResult]",
+                tuple[int, typing.Optional[float]],
+            ] = {}
+
+            def submit(index: int) -> None:
+                timeout = parent_timeout(tasks[index])
+                deadline = time.monotonic() + timeout if timeout else None
+                running[executor.submit(run_task, tasks[index])] = index, deadline
+                return None
+
+            while True:
+                if suspects and not running:
+                    submit(suspects.popleft())
+                while not suspects and waiting and len(running) < workers:
+                    submit(waiting.popleft())
+                if not running:
+                    break
+
+                deadlines = [
+                    deadline for _, deadline in running.values() if deadline is not None
+                ]
+                wait_time = (
+                    max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                )
+                done, _ = concurrent.futures.wait(
+                    running, wait_time, concurrent.futures.FIRST_COMPLETED
+                )
+                if any(future.exception() for future in done):
+                    # A broken pool fails every running future, let them all land.
+                    done, _ = concurrent.futures.wait(running)
+                crashed: dict[int, BaseException] = {}
+                for future in done:
+                    index, _ = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except concurrent.futures.process.BrokenProcessPool as error:
+                        crashed[index] = error
+                    except Exception as error:
+                        results[index] = failed_result(tasks[index], error)
+                if len(crashed) == 1:
+                    for index, error in crashed.items():
+                        results[index] = failed_result(tasks[index], error)
+                else:
+                    suspects.extend(sorted(crashed))
+
+                now = time.monotonic()
+                expired = [
+                    future
+                    for future, (_, deadline) in running.items()
+                    if deadline is not None and deadline <= now
+                ]
+                for future in expired:
+                    index, _ = running.pop(future)
+                    results[index] = failed_result(
+                        tasks[index],
+                        TimeoutError(
+                            f"part exceeded {parent_timeout(tasks[index])}s"
+                            " and its worker was killed"
+                        ),
+                    )
+                if expired:
+                    waiting.extendleft(
+                        sorted((index for index, _ in running.values()), reverse=True)
+                    )
+                    running.clear()
+                    kill_workers()
+
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+                if crashed or expired:
+                    break
+    while next_index in results:
+        yield results.pop(next_index)
+        next_index += 1
+
+
+def create_report(results: list[PartResult]) -> dict[str, typing.Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": [dataclasses.asdict(result) for result in results],
+    }
+
+
+def write_json(results: list[PartResult], output: typing.TextIO) -> None:
+    json.dump(create_report(results), output, indent=2)
+    output.write("\n")
+    return None
+
+
+def write_csv(results: list[PartResult], output: typing.TextIO) -> None:
+    writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS)
+    writer.writeheader()
+    for result in results:
+        row = dataclasses.asdict(result)
+        row["hot_functions"] = "; ".join(result.hot_functions)
+        writer.writerow(row)
+    return None
+
+
+def write_hot_functions(results: list[PartResult], output: typing.TextIO) -> None:
+    for result in results:
+        if not result.hot_functions:
+            continue
+        output.write(f"{result.module} part {result.part}:\n")
+        for hot_function in result.hot_functions:
+            output.write(f"  {hot_function}\n")
+    return None
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run Advent of Code solvers and report timing and memory."
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default all)")
+    parser.add_argument(
+        "-p",
+        "--part",
+        dest="parts",
+        action="append",
+        type=int,
+        choices=sorted(PARTS),
+        help="part to run, may be repeated (default both)",
+    )
+    parser.add_argument(
+        "-m", "--module", help="only run modules whose file name contains this"
+    )
+    parser.add_argument(
+        "-i",
+        "--input-directory",
+        type=pathlib.Path,
+        help="directory containing the puzzle input files",
+    )
+    parser.add_argument("--input", help="input file to use instead of FILENAME")
+    parser.add_argument(
+        "--test-input",
+        action="store_true",
+        help="use each module's TEST_FILENAME (and TEST_FILE_DEFAULTS)",
+    )
+    parser.add_argument("-f", "--format", choices=("json", "csv"), default="json")
+    parser.add_argument("-o", "--output", type=pathlib.Path, help="report file")
+    parser.add_argument(
+        "--no-tracemalloc",
+        dest="trace_memory",
+        action="store_false",
+        help="skip the second, traced run used to measure tracemalloc peaks",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes to run parts in, 0 for one per CPU (default 1)",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="seconds before a part is interrupted and reported as failed",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="reuse parsed inputs cached on disk between runs",
+    )
+    parser.add_argument(
+        "--parse-cache-directory",
+        type=pathlib.Path,
+        help="directory for the parsed-input cache (implies --parse-cache)",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile_directory",
+        type=pathlib.Path,
+        help="profile every part and write .pstats/.collapsed files here",
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=PROFILERS,
+        default="both",
+        help="cProfile, the SIGPROF sampling profiler, or both (default both)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="report progress of long-running loops on stderr",
+    )
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    day_modules = select_day_modules(discover_day_modules(), args.days, args.module)
+    if not day_modules:
+        print("No day modules selected", file=sys.stderr)
+        return 1
+    filename = os.path.abspath(args.input) if args.input else None
+    profile_directory = (
+        args.profile_directory.resolve() if args.profile_directory else None
+    )
+    if args.parse_cache or args.parse_cache_directory:
+        os.environ[ENABLED_VARIABLE] = "1"
+    if args.progress:
+        os.environ[PROGRESS_VARIABLE] = "1"
+    if args.parse_cache_directory:
+        os.environ[DIRECTORY_VARIABLE] = str(args.parse_cache_directory.resolve())
+    if args.input_directory:
+        os.chdir(args.input_directory)
+
+    tasks = create_tasks(
+        day_modules,
+        args.parts or sorted(PARTS),
+        filename,
+        args.trace_memory,
+        args.timeout,
+        profile_directory,
+        args.profiler,
+        args.test_input,
+    )
+    results = list(run_tasks(tasks, args.jobs))
+    if profile_directory:
+        write_hot_functions(results, sys.stderr)
+
+    write_report = write_csv if args.format == "csv" else write_json
+    if args.output:
+        with open(args.output, "w", newline="") as output:
+            write_report(results, output)
+    else:
+        write_report(results, sys.stdout)
+
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import array
+import collections
+import dataclasses
+import heapq
+import typing
+
+from progress import DISABLED_PROGRESS, DisabledProgress, Progress
+
+
+UNREACHED: typing.Final[int] = -1
+NO_PARENT: typing.Final[int] = -1
+
+Neighbours = typing.Callable[[int], typing.Iterable[int]]
+WeightedNeighbours = typing.Callable[[int], typing.Iterable[tuple[int, int]]]
+IsGoal = typing.Callable[[int], bool]
+Heuristic = typing.Callable[[int], int]
+
+
+class SparseTable(dict[int, int]):
+    __slots__ = ("fill",)
+
+    def __init__(self, fill: int) -> None:
+        super().__init__()
+        self.fill = fill
+
+    def __missing__(self, node: int) -> int:
+        return self.fill
+
+
+Table = typing.Union[array.array, SparseTable]
+
+
+def create_table(node_count: typing.Optional[int], fill: int) -> Table:
+    if node_count is None:
+        return SparseTable(fill)
+    return array.array("q", [fill]) * node_count
+
+
+@dataclasses.dataclass(slots=True)
+class SearchResult:
+    start: int
+    distances: Table
+    parents: Table
+    order: array.array = dataclasses.field(default_factory=lambda: array.array("q"))
+    predecessors: typing.Optional[dict[int, list[int]]] = None
+    goals: list[int] = dataclasses.field(default_factory=list)
+
+    @property
+    def goal(self) -> typing.Optional[int]:
+        return self.goals[0] if self.goals else None
+
+    def reached(self, node: int) -> bool:
+        return self.distances[node] != UNREACHED
+
+    def distance(self, node: int) -> int:
+        return self.distances[node]
+
+    def path(self, node: int) -> list[int]:
+        if not self.reached(node):
+            return []
+        path = [node]
+        while self.parents[node] != NO_PARENT:
+            node = self.parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+    def path_nodes(self, nodes: typing.Iterable[int]) -> set[int]:
+        if self.predecessors is None:
+            return {path_node for node in nodes for path_node in self.path(node)}
+        found: set[int] = set()
+        stack = [node for node in nodes if self.reached(node)]
+        while stack:
+            node = stack.pop()
+            if node in found:
+                continue
+            found.add(node)
+            stack.extend(self.predecessors.get(node, ()))
+        return found
+
+    def path_counts(self) -> dict[int, int]:
+        if self.predecessors is None:
+            raise ValueError("Path counts need a search with all_predecessors")
+        counts = {self.start: 1}
+        for node in sorted(self.order, key=self.distances.__getitem__):
+            if node != self.start:
+                counts[node] = sum(
+                    counts.get(predecessor, 0)
+                    for predecessor in self.predecessors[node]
+                )
+        return counts
+
+
+def create_result(
+    node_count: typing.Optional[int], start: int, all_predecessors: bool
+) -> SearchResult:
+    result = SearchResult(
+        start,
+        create_table(node_count, UNREACHED),
+        create_table(node_count, NO_PARENT),
+        predecessors={start: []} if all_predecessors else None,
+    )
+    result.distances[start] = 0
+    return result
+
+
+def breadth_first_search(
+    node_count: typing.Optional[int],
+    start: int,
+    neighbours: Neighbours,
+    is_goal: typing.Optional[IsGoal] = None,
+    all_predecessors: bool = False,
+    progress: typing.Union[Progress, DisabledProgress] = DISABLED_PROGRESS,
+) -> SearchResult:
+    result = create_result(node_count, start, all_predecessors)
+    distances = result.distances
+    parents = result.parents
+    predecessors = result.predecessors
+    order = result.order
+    goal_distance = UNREACHED
+    queue = collections.deque([start])
+    while queue:
+        node = queue.popleft()
+        distance = distances[node]
+        if goal_distance != UNREACHED and distance > goal_distance:
+            break
+        order.append(node)
+        progress.advance(queue=len(queue))
+        if is_goal is not None and is_goal(node):
+            goal_distance = distance
+            result.goals.append(node)
+            if predecessors is None:
+                break
+            continue
+
+        neighbour_distance = distance + 1
+        for neighbour in neighbours(node):
+            current_distance = distances[neighbour]
+            if current_distance == UNREACHED:
+                distances[neighbour] = neighbour_distance
+                parents[neighbour] = node
+                if predecessors is not None:
+                    predecessors[neighbour] = [node]
+                queue.append(neighbour)
+            elif predecessors is not None and current_distance == neighbour_distance:
+                predecessors[neighbour].append(node)
+    return result
+
+
+def dijkstra_search(
+    node_count: typing.Optional[int],
+    start: int,
+    neighbours: WeightedNeighbours,
+    is_goal: typing.Optional[IsGoal] = None,
+    heuristic: typing.Optional[Heuristic] = None,
+    all_predecessors: bool = False,
+    progress: typing.Union[Progress, DisabledProgress] = DISABLED_PROGRESS,
+) -> SearchResult:
+    result = create_result(node_count, start, all_predecessors)
+    distances = result.distances
+    parents = result.parents
+    predecessors = result.predecessors
+    order = result.order
+    settled = create_table(node_count, 0)
+    goal_distance = UNREACHED
+    queue = [(heuristic(start) if heuristic else 0, start)]
+    while queue:
+        priority, node = heapq.heappop(queue)
+        if settled[node]:
+            continue
+        if goal_distance != UNREACHED and priority > goal_distance:
+            break
+        settled[node] = 1
+        order.append(node)
+        progress.advance(queue=len(queue))
+        distance = distances[node]
+        if is_goal is not None and is_goal(node):
+            goal_distance = distance
+            result.goals.append(node)
+            if predecessors is None:
+                break
+            continue
+
+        for neighbour, cost in neighbours(node):
+            neighbour_distance = distance + cost
+            current_distance = distances[neighbour]
+            if current_distance == neighbour_distance:
+                # With a heuristic an equally cheap predecessor can settle
+                # after the node it leads to, so settled nodes still collect it.
+                if predecessors is not None:
+                    predecessors[neighbour].append(node)
+            elif current_distance == UNREACHED or neighbour_distance < current_distance:
+                if settled[neighbour]:
+                    continue
+                distances[neighbour] = neighbour_distance
+                parents[neighbour] = node
+                if predecessors is not None:
+                    predecessors[neighbour] = [node]
+                if heuristic is not None:
+                    neighbour_distance += heuristic(neighbour)
+                heapq.heappush(queue, (neighbour_distance, neighbour))
+    return result
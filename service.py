@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import pathlib
+import signal
+import sys
+import time
+import typing
+
+from geometry import clear_locations
+from loader import InputFile, clear_input_cache, prime_input, read_input_file
+from parse_cache import ENABLED_VARIABLE
+from runner import (
+    PARTS,
+    DayModule,
+    PartResult,
+    Task,
+    discover_day_modules,
+    parent_timeout,
+    run_task,
+    select_day_modules,
+)
+
+
+QUEUE_FACTOR = 2
+
+
+@dataclasses.dataclass(frozen=True)
+class Job:
+    day: int
+    part: int
+    input: str
+    job_id: typing.Optional[str] = None
+    module: typing.Optional[str] = None
+
+
+@dataclasses.dataclass
+class ServiceStats:
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+    passed: int = 0
+    failed: int = 0
+
+    @property
+    def jobs(self) -> int:
+        return self.passed + self.failed
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.jobs / elapsed if elapsed > 0 else 0.0
+        return (
+            f"{self.jobs} jobs, {self.passed} passed, {self.failed} failed "
+            f"in {elapsed:.2f}s ({rate:.1f} jobs/s)"
+        )
+
+
+def parse_job(line: str) -> Job:
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("Job must be a JSON object")
+    part = int(data["part"])
+    if part not in PARTS:
+        raise ValueError(f"Invalid part: {part}")
+    job_id = data.get("id")
+    return Job(
+        int(data["day"]),
+        part,
+        os.path.abspath(data["input"]),
+        str(job_id) if job_id is not None else None,
+        data.get("module"),
+    )
+
+
+def find_day_module(job: Job, day_modules: list[DayModule]) -> DayModule:
+    candidates = select_day_modules(day_modules, [job.day], job.module)
+    if not candidates:
+        raise ValueError(f"No module for day {job.day}")
+    if len(candidates) > 1:
+        labels = ", ".join(day_module.label for day_module in candidates)
+        raise ValueError(f"Day {job.day} is ambiguous, choose a module: {labels}")
+    return candidates[0]
+
+
+# The buffer and its line spans are all that cross to the worker; it decodes
+# lines itself, so the text is never pickled alongside the bytes.
+def read_job_input(filename: str) -> InputFile:
+    return read_input_file(filename, mapped=False)
+
+
+def solve_task(task: Task, input_file: InputFile) -> PartResult:
+    prime_input(input_file)
+    try:
+        return run_task(task)
+    finally:
+        clear_input_cache()
+        clear_locations()
+
+
+def job_record(
+    line_number: int,
+    job: typing.Optional[Job],
+    result: typing.Optional[PartResult] = None,
+    error: typing.Optional[str] = None,
+) -> dict[str, typing.Any]:
+    record: dict[str, typing.Any] = {"line": line_number}
+    if job:
+        record.update(id=job.job_id, day=job.day, part=job.part, input=job.input)
+    if result:
+        record.update(dataclasses.asdict(result))
+    if error:
+        record["error"] = error
+    return record
+
+
+# Every job gets a worker of its own, so a part that kills its process only
+# breaks its own pool, peak_rss_kb is that job's alone, and a part stuck past
+# its deadline in C code, where SIGALRM cannot reach it, can be killed
+# without touching the jobs solving beside it.
+async def solve_in_worker(task: Task, input_file: InputFile) -> PartResult:
+    import concurrent.futures
+
+    loop = asyncio.get_running_loop()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+    try:
+        pid = await loop.run_in_executor(executor, os.getpid)
+        timeout = parent_timeout(task)
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, solve_task, task, input_file),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            os.kill(pid, signal.SIGKILL)
+            raise TimeoutError(
+                f"part exceeded {timeout}s and its worker was killed"
+            ) from None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def read_jobs(
+    lines: typing.TextIO,
+    queue: "asyncio.Queue[typing.Optional[tuple[int, str]]]",
+    workers: int,
+) -> None:
+    line_number = 0
+    while True:
+        line = await asyncio.to_thread(lines.readline)
+        if not line:
+            break
+        line_number += 1
+        if line.strip():
+            await queue.put((line_number, line))
+    for _ in range(workers):
+        await queue.put(None)
+    return None
+
+
+async def solve_job(
+    line_number: int,
+    line: str,
+    day_modules: list[DayModule],
+    workers: asyncio.Semaphore,
+    timeout: typing.Optional[float],
+) -> dict[str, typing.Any]:
+    job: typing.Optional[Job] = None
+    try:
+        job = parse_job(line)
+        day_module = find_day_module(job, day_modules)
+        input_file = await asyncio.to_thread(read_job_input, job.input)
+        task = Task(day_module, job.part, job.input, False, timeout)
+        async with workers:
+            result = await solve_in_worker(task, input_file)
+    except Exception as error:
+        return job_record(line_number, job, error=f"{type(error).__name__}: {error}")
+    return job_record(line_number, job, result)
+
+
+async def serve_jobs(
+    queue: "asyncio.Queue[typing.Optional[tuple[int, str]]]",
+    day_modules: list[DayModule],
+    workers: asyncio.Semaphore,
+    timeout: typing.Optional[float],
+    output: typing.TextIO,
+    stats: ServiceStats,
+) -> None:
+    while (item := await queue.get()) is not None:
+        line_number, line = item
+        record = await solve_job(line_number, line, day_modules, workers, timeout)
+        if record.get("error"):
+            stats.failed += 1
+        else:
+            stats.passed += 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+    return None
+
+
+async def serve(
+    lines: typing.TextIO,
+    output: typing.TextIO,
+    jobs: int = 0,
+    concurrency: typing.Optional[int] = None,
+    queue_size: typing.Optional[int] = None,
+    timeout: typing.Optional[float] = None,
+    day_modules: typing.Optional[list[DayModule]] = None,
+) -> ServiceStats:
+    jobs = jobs or os.cpu_count() or 1
+    concurrency = concurrency or jobs * QUEUE_FACTOR
+    day_modules = day_modules if day_modules is not None else discover_day_modules()
+    queue: asyncio.Queue[typing.Optional[tuple[int, str]]] = asyncio.Queue(
+        queue_size or concurrency
+    )
+    stats = ServiceStats()
+    workers = asyncio.Semaphore(jobs)
+    await asyncio.gather(
+        read_jobs(lines, queue, concurrency),
+        *(
+            serve_jobs(queue, day_modules, workers, timeout, output, stats)
+            for _ in range(concurrency)
+        ),
+    )
+    return stats
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Solve a stream of JSON lines jobs such as "
+            '{"day": 5, "part": 1, "input": "day05_data.txt"} '
+            "and write one JSON result line per job as it finishes."
+        )
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=pathlib.Path,
+        help="JSON lines job file (default stdin)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=pathlib.Path, help="result file (default stdout)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes to solve in, 0 for one per CPU (default 0)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        help="jobs read, parsed or solving at once (default twice --jobs)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="jobs buffered before reading pauses (default --concurrency)",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="seconds before a job is interrupted and reported as failed",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="reuse parsed inputs cached on disk between jobs and runs",
+    )
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    if args.parse_cache:
+        os.environ[ENABLED_VARIABLE] = "1"
+
+    with contextlib.ExitStack() as stack:
+        lines = stack.enter_context(open(args.input)) if args.input else sys.stdin
+        output = (
+            stack.enter_context(open(args.output, "w")) if args.output else sys.stdout
+        )
+        stats = asyncio.run(
+            serve(
+                lines,
+                output,
+                args.jobs,
+                args.concurrency,
+                args.queue_size,
+                args.timeout,
+            )
+        )
+    print(stats.summary(), file=sys.stderr)
+    return 0 if not stats.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
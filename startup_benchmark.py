@@ -0,0 +1,183 @@
+import argparse
+import dataclasses
+import json
+import re
+import subprocess
+import sys
+import typing
+
+from runner import (
+    REPO_DIRECTORY,
+    DayModule,
+    discover_day_modules,
+    select_day_modules,
+)
+
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+RUNNER_BUDGET_MS = 100.0
+MODULE_BUDGET_MS = 25.0
+CHILD_SCRIPT = """
+import pathlib
+import sys
+import time
+
+start = time.perf_counter()
+import runner
+
+runner_imported = time.perf_counter()
+runner.load_day_module(runner.DayModule({day}, pathlib.Path({path!r})))
+module_loaded = time.perf_counter()
+print(runner_imported - start, module_loaded - runner_imported, file=sys.stderr)
+"""
+
+
+@dataclasses.dataclass
+class StartupResult:
+    day: int
+    module: str
+    runner_import_ms: float
+    module_load_ms: float
+    dependency_imports_ms: dict[str, float] = dataclasses.field(default_factory=dict)
+    error: typing.Optional[str] = None
+
+    def within_budget(self, runner_budget_ms: float, module_budget_ms: float) -> bool:
+        return (
+            self.error is None
+            and self.runner_import_ms <= runner_budget_ms
+            and self.module_load_ms <= module_budget_ms
+        )
+
+
+def parse_import_times(lines: typing.Iterable[str], after: str) -> dict[str, float]:
+    import_times: dict[str, float] = {}
+    found_after = False
+    for line in lines:
+        match = IMPORT_TIME_PATTERN.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if len(indent) != 1:
+            continue
+        if found_after:
+            import_times[name] = int(cumulative) / 1000
+        elif name == after:
+            found_after = True
+    return import_times
+
+
+def measure_startup(day_module: DayModule) -> StartupResult:
+    script = CHILD_SCRIPT.format(day=day_module.day, path=str(day_module.path))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_DIRECTORY,
+        capture_output=True,
+        text=True,
+    )
+    result = StartupResult(day_module.day, day_module.label, 0.0, 0.0)
+    lines = completed.stderr.splitlines()
+    if completed.returncode != 0:
+        result.error = lines[-1] if lines else f"exit code {completed.returncode}"
+        return result
+
+    runner_import, module_load = lines[-1].split()
+    result.runner_import_ms = float(runner_import) * 1000
+    result.module_load_ms = float(module_load) * 1000
+    result.dependency_imports_ms = parse_import_times(lines, "runner")
+    return result
+
+
+def best_startup(day_module: DayModule, repeat: int) -> StartupResult:
+    results = [measure_startup(day_module) for _ in range(repeat)]
+    return min(
+        results,
+        key=lambda result: (
+            result.error is not None,
+            result.runner_import_ms + result.module_load_ms,
+        ),
+    )
+
+
+def write_text(
+    results: list[StartupResult],
+    runner_budget_ms: float,
+    module_budget_ms: float,
+    output: typing.TextIO,
+) -> None:
+    for result in results:
+        status = (
+            "ok" if result.within_budget(runner_budget_ms, module_budget_ms) else "SLOW"
+        )
+        if result.error:
+            status = f"ERROR {result.error}"
+        dependencies = ", ".join(
+            f"{name} {milliseconds:.1f}ms"
+            for name, milliseconds in sorted(
+                result.dependency_imports_ms.items(),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+        )
+        output.write(
+            f"{result.module:32} runner {result.runner_import_ms:7.1f}ms"
+            f"  module {result.module_load_ms:7.1f}ms  {status}"
+            + (f"  [{dependencies}]" if dependencies else "")
+            + "\n"
+        )
+    return None
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure runner import and day module load time against a budget."
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to measure")
+    parser.add_argument(
+        "-m", "--module", help="only measure modules whose file name contains this"
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="fresh interpreters per module, the fastest is kept (default 3)",
+    )
+    parser.add_argument(
+        "--runner-budget",
+        type=float,
+        default=RUNNER_BUDGET_MS,
+        help=f"milliseconds allowed to import the runner (default {RUNNER_BUDGET_MS})",
+    )
+    parser.add_argument(
+        "--module-budget",
+        type=float,
+        default=MODULE_BUDGET_MS,
+        help=f"milliseconds allowed to load a day module (default {MODULE_BUDGET_MS})",
+    )
+    parser.add_argument("-f", "--format", choices=("text", "json"), default="text")
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    day_modules = select_day_modules(discover_day_modules(), args.days, args.module)
+    if not day_modules:
+        print("No day modules selected", file=sys.stderr)
+        return 1
+
+    results = [best_startup(day_module, args.repeat) for day_module in day_modules]
+    if args.format == "json":
+        json.dump([dataclasses.asdict(result) for result in results], sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        write_text(results, args.runner_budget, args.module_budget, sys.stdout)
+
+    within_budget = all(
+        result.within_budget(args.runner_budget, args.module_budget)
+        for result in results
+    )
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
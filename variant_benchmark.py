@@ -0,0 +1,320 @@
+import argparse
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+import types
+import typing
+
+from generators import DEFAULT_SEED, generate_input
+from runner import PARTS, discover_day_modules, load_day_module, select_day_modules
+
+
+DEFAULT_SCALE = 100.0
+DEFAULT_REPEAT = 3
+NOT_AVAILABLE = "not available"
+
+Solve = typing.Callable[[types.ModuleType, list[str]], typing.Any]
+Available = typing.Callable[[types.ModuleType], bool]
+
+
+def always_available(module: types.ModuleType) -> bool:
+    return True
+
+
+@dataclasses.dataclass(frozen=True)
+class Variant:
+    day: int
+    part: int
+    name: str
+    solve: Solve
+    available: Available = always_available
+    module: typing.Optional[str] = None
+
+
+@dataclasses.dataclass
+class VariantResult:
+    day: int
+    part: int
+    name: str
+    lines: int
+    answer: typing.Optional[str] = None
+    error: typing.Optional[str] = None
+    best_time: float = 0.0
+    speedup: typing.Optional[float] = None
+    tracemalloc_peak: typing.Optional[int] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+
+def sorted_total_distance(location_ids: typing.Any) -> int:
+    location_ids.sort_groups()
+    return location_ids.total_distance()
+
+
+def parse_memory(module: types.ModuleType, lines: list[str], part: int) -> int:
+    memory_parser = module.MemoryParser(use_conditional=part == 2)
+    for line in lines:
+        for character in line:
+            memory_parser.add_character(character)
+    return memory_parser.total
+
+
+def scan_memory(module: types.ModuleType, lines: list[str], part: int) -> int:
+    memory_scanner = module.MemoryScanner(use_conditional=part == 2)
+    memory_scanner.scan("".join(lines).encode())
+    return memory_scanner.total
+
+
+VARIANTS: tuple[Variant, ...] = (
+    Variant(
+        1,
+        1,
+        "dataclass",
+        lambda module, lines: sorted_total_distance(
+            module.create_location_ids(iter(lines))
+        ),
+    ),
+    Variant(
+        1,
+        1,
+        "compact",
+        lambda module, lines: sorted_total_distance(
+            module.create_compact_location_ids(iter(lines))
+        ),
+    ),
+    Variant(
+        1,
+        1,
+        "numpy",
+        lambda module, lines: sorted_total_distance(
+            module.create_array_location_ids(iter(lines))
+        ),
+        lambda module: module.numpy_available(),
+    ),
+    Variant(
+        1,
+        2,
+        "dataclass",
+        lambda module, lines: module.create_location_ids(
+            iter(lines)
+        ).similarity_score(),
+    ),
+    Variant(
+        1,
+        2,
+        "compact",
+        lambda module, lines: module.create_compact_location_ids(
+            iter(lines)
+        ).similarity_score(),
+    ),
+    Variant(
+        1,
+        2,
+        "numpy",
+        lambda module, lines: module.create_array_location_ids(
+            iter(lines)
+        ).similarity_score(),
+        lambda module: module.numpy_available(),
+    ),
+    Variant(
+        2,
+        1,
+        "reports",
+        lambda module, lines: module.create_reports(iter(lines)).safe_report_count(),
+    ),
+    Variant(
+        2,
+        1,
+        "numpy",
+        lambda module, lines: module.create_report_batch(
+            iter(lines)
+        ).safe_report_count(),
+        lambda module: module.numpy_available(),
+    ),
+    Variant(3, 1, "characters", lambda module, lines: parse_memory(module, lines, 1)),
+    Variant(3, 1, "scanner", lambda module, lines: scan_memory(module, lines, 1)),
+    Variant(3, 2, "characters", lambda module, lines: parse_memory(module, lines, 2)),
+    Variant(3, 2, "scanner", lambda module, lines: scan_memory(module, lines, 2)),
+)
+
+
+def load_variant_module(variant: Variant) -> types.ModuleType:
+    day_modules = select_day_modules(
+        discover_day_modules(), [variant.day], variant.module
+    )
+    if len(day_modules) != 1:
+        raise ValueError(f"Expected one module for day {variant.day}")
+    return load_day_module(day_modules[0])
+
+
+def run_variant(
+    variant: Variant,
+    lines: list[str],
+    repeat: int = DEFAULT_REPEAT,
+    trace_memory: bool = False,
+) -> VariantResult:
+    result = VariantResult(variant.day, variant.part, variant.name, len(lines))
+    try:
+        module = load_variant_module(variant)
+        if not variant.available(module):
+            result.error = NOT_AVAILABLE
+            return result
+        times: list[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            answer = variant.solve(module, lines)
+            times.append(time.perf_counter() - start)
+        if trace_memory:
+            tracemalloc.start()
+            variant.solve(module, lines)
+            _, result.tracemalloc_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    except Exception as error:
+        result.error = f"{type(error).__name__}: {error}"
+        return result
+    result.answer = str(answer)
+    result.best_time = min(times)
+    return result
+
+
+def compare_results(results: list[VariantResult]) -> None:
+    baseline = next((result for result in results if result.passed), None)
+    if not baseline:
+        return None
+    for result in results:
+        if not result.passed:
+            continue
+        if result.answer != baseline.answer:
+            result.error = (
+                f"answer {result.answer} != {baseline.name} {baseline.answer}"
+            )
+            continue
+        if result.best_time > 0:
+            result.speedup = baseline.best_time / result.best_time
+    return None
+
+
+def benchmark_variants(
+    variants: typing.Sequence[Variant],
+    scale: float = DEFAULT_SCALE,
+    seed: int = DEFAULT_SEED,
+    repeat: int = DEFAULT_REPEAT,
+    trace_memory: bool = False,
+) -> list[VariantResult]:
+    all_results: list[VariantResult] = []
+    lines_by_day: dict[int, list[str]] = {}
+    for day, part in sorted({(variant.day, variant.part) for variant in variants}):
+        if day not in lines_by_day:
+            lines_by_day[day] = [
+                line.strip() for line in generate_input(day, scale, seed).splitlines()
+            ]
+        results = [
+            run_variant(variant, lines_by_day[day], repeat, trace_memory)
+            for variant in variants
+            if variant.day == day and variant.part == part
+        ]
+        compare_results(results)
+        all_results.extend(results)
+    return all_results
+
+
+def write_text(results: list[VariantResult], output: typing.TextIO) -> None:
+    heading: typing.Optional[tuple[int, int]] = None
+    for result in results:
+        if heading != (result.day, result.part):
+            heading = (result.day, result.part)
+            output.write(
+                f"day {result.day} part {result.part} ({result.lines} lines)\n"
+            )
+        if not result.passed:
+            output.write(f"  {result.name:12} {result.error}\n")
+            continue
+        speedup = f"{result.speedup:7.2f}x" if result.speedup else "      -"
+        memory = (
+            f" {result.tracemalloc_peak // 1024:>9} KiB"
+            if result.tracemalloc_peak is not None
+            else ""
+        )
+        output.write(
+            f"  {result.name:12} {result.best_time:10.4f}s {speedup}{memory}"
+            f"  {result.answer}\n"
+        )
+    return None
+
+
+def write_json(results: list[VariantResult], output: typing.TextIO) -> None:
+    json.dump([dataclasses.asdict(result) for result in results], output, indent=2)
+    output.write("\n")
+    return None
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare alternative implementations of a part on generated input."
+    )
+    parser.add_argument("days", nargs="*", type=int, help="days to compare")
+    parser.add_argument(
+        "-p",
+        "--part",
+        dest="parts",
+        action="append",
+        type=int,
+        choices=sorted(PARTS),
+        help="part to compare, may be repeated (default both)",
+    )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        default=DEFAULT_SCALE,
+        help=f"input size relative to the official input (default {DEFAULT_SCALE:g})",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"runs per variant, the best is reported (default {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        dest="trace_memory",
+        action="store_true",
+        help="also measure tracemalloc peaks with one extra run",
+    )
+    parser.add_argument("-f", "--format", choices=("text", "json"), default="text")
+    return parser
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    variants = [
+        variant
+        for variant in VARIANTS
+        if (not args.days or variant.day in args.days)
+        and (not args.parts or variant.part in args.parts)
+    ]
+    if not variants:
+        print("No variants selected", file=sys.stderr)
+        return 1
+
+    results = benchmark_variants(
+        variants, args.scale, args.seed, args.repeat, args.trace_memory
+    )
+    write_report = write_json if args.format == "json" else write_text
+    write_report(results, sys.stdout)
+    failed = [
+        result
+        for result in results
+        if not result.passed and result.error != NOT_AVAILABLE
+    ]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())